@@ -1,13 +1,39 @@
 from __future__ import annotations
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
-import Game
-import Player
-from utils import catinlist, getcard, players_around
-from nn.network_definition import DominionNetwork
+from utils import CategoryBits, catinlist, getcard, players_around
+
+if TYPE_CHECKING:
+    import Game
+    import Player
+    from nn.network_definition import DominionNetwork
 
 
 class Card:
+    __slots__ = (
+        "name",
+        "categories",
+        "flags",
+        "is_curse",
+        "is_victory",
+        "is_action",
+        "is_coin",
+        "is_attack",
+        "is_reaction",
+        "is_duration",
+        "cost",
+        "buys",
+        "actions",
+        "buypower",
+        "coins",
+        "vpoints",
+        "draws",
+    )
+
+    # Treasures that can be played without a decision set the order they are
+    # played in; None leaves the card to the player
+    autoplay_order: int = None
+
     def __init__(
         self,
         name: str,
@@ -30,16 +56,20 @@ class Card:
         self.vpoints = vpoints
         self.draws = draws
 
+        self.flags = 0
         for category in self.categories:
-            assert category in [
-                "curse",
-                "victory",
-                "action",
-                "coin",
-                "attack",
-                "reaction",
-                "duration",
-            ]
+            assert category in CategoryBits
+            self.flags |= CategoryBits[category]
+        self.is_curse = self.has_category("curse")
+        self.is_victory = self.has_category("victory")
+        self.is_action = self.has_category("action")
+        self.is_coin = self.has_category("coin")
+        self.is_attack = self.has_category("attack")
+        self.is_reaction = self.has_category("reaction")
+        self.is_duration = self.has_category("duration")
+
+    def has_category(self, category: str) -> bool:
+        return bool(self.flags & CategoryBits[category])
 
     def get_points(self, player: Player.Player):
         return self.vpoints
@@ -99,9 +129,8 @@ class Card:
     ):
         return False
 
-    def use(self, player: Player.Player, trash: List[Card]):
-        player.played.append(self)
-        player.hand.remove(self)
+    def use(self, player: Player.Player, game: Game.Game):
+        player.move_card(self, "hand", "played")
 
     def augment(self, player: Player.Player, draw: bool = True):
         player.actions += self.actions
@@ -122,26 +151,40 @@ class Card:
 
 
 class Copper(Card):
+    __slots__ = ()
+    autoplay_order = 0
+
     def __init__(self):
         Card.__init__(self, "Copper", ["coin"], cost=0, buypower=1)
 
 
 class Silver(Card):
+    __slots__ = ()
+    autoplay_order = 0
+
     def __init__(self):
         Card.__init__(self, "Silver", ["coin"], cost=3, buypower=2)
 
 
 class Gold(Card):
+    __slots__ = ()
+    autoplay_order = 0
+
     def __init__(self):
         Card.__init__(self, "Gold", ["coin"], cost=6, buypower=3)
 
 
 class Platinum(Card):
+    __slots__ = ()
+    autoplay_order = 0
+
     def __init__(self):
         Card.__init__(self, "Platinum", ["coin"], cost=9, buypower=5)
 
 
 class IllGottenGains(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Ill-Gotten Gains", ["coin"], cost=5, buypower=1)
 
@@ -153,14 +196,14 @@ class IllGottenGains(Card):
         mock: bool,
     ):
         for player in players_around(game.players, this_player, inclusive=False):
-            if len(game.supply["Curse"]) > 0:
-                player.discard.append(game.supply["Curse"].pop())
+            if game.supply["Curse"] > 0:
+                player.take_from_supply(game, "Curse")
 
     @staticmethod
     def yes_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        player.hand.append(game.supply["Copper"].pop())
+        player.take_from_supply(game, "Copper", "hand")
         return 0
 
     @staticmethod
@@ -178,7 +221,7 @@ class IllGottenGains(Card):
     ):
         player.purse += self.buypower
 
-        if len(game.supply["Copper"]) > 0:
+        if game.supply["Copper"] > 0:
             if player.yesnoinput(
                 "Would you like to gain a copper to your hand?",
                 game,
@@ -193,6 +236,10 @@ class IllGottenGains(Card):
 
 
 class Treasure_Trove(Card):
+    __slots__ = ()
+    # Its gains go to the discard pile, so it can be played in any order
+    autoplay_order = 0
+
     def __init__(self):
         Card.__init__(self, "Treasure Trove", ["coin"], cost=5, buypower=2)
 
@@ -205,13 +252,16 @@ class Treasure_Trove(Card):
     ):
         player.purse += self.buypower
 
-        if len(game.supply["Gold"]) > 0:
-            player.discard.append(game.supply["Gold"].pop())
-        if len(game.supply["Copper"]) > 0:
-            player.discard.append(game.supply["Copper"].pop())
+        if game.supply["Gold"] > 0:
+            player.take_from_supply(game, "Gold")
+        if game.supply["Copper"] > 0:
+            player.take_from_supply(game, "Copper")
 
 
 class Cache(Card):
+    __slots__ = ()
+    autoplay_order = 0
+
     def __init__(self):
         Card.__init__(self, "Cache", ["coin"], cost=5, buypower=3)
 
@@ -223,11 +273,14 @@ class Cache(Card):
         mock: bool,
     ):
         for _ in range(2):
-            if len(game.supply["Copper"]) > 0:
-                player.discard.append(game.supply["Copper"].pop())
+            if game.supply["Copper"] > 0:
+                player.take_from_supply(game, "Copper")
 
 
 class Bank(Card):
+    __slots__ = ()
+    autoplay_order = 1
+
     def __init__(self):
         Card.__init__(self, "Bank", ["coin"], cost=7)
 
@@ -240,70 +293,81 @@ class Bank(Card):
     ):
         player.purse += 1
         for card in player.played:
-            if "coin" in card.categories:
+            if card.is_coin:
                 player.purse += 1
 
 
 class Harem(Card):
+    __slots__ = ()
+    autoplay_order = 0
+
     def __init__(self):
         Card.__init__(self, "Harem", ["coin", "victory"], cost=6, buypower=2, vpoints=2)
 
 
 class Curse(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Curse", ["curse"], cost=0, vpoints=-1)
 
 
 class Estate(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Estate", ["victory"], cost=2, vpoints=1)
 
 
 class Duchy(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Duchy", ["victory"], cost=5, vpoints=3)
 
 
 class Province(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Province", ["victory"], cost=8, vpoints=6)
 
 
 class Colony(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Colony", ["victory"], cost=11, vpoints=10)
 
 
 class Gardens(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Gardens", ["victory"], cost=4)
 
     def get_points(self, player: Player.Player):
-        return len(player.stack()) // 10
+        return player.num_cards // 10
 
 
 class Duke(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Duke", ["victory"], cost=5)
 
     def get_points(self, player: Player.Player):
-        duchies = 0
-        for card in player.stack():
-            if card.name == "Duchy":
-                duchies += 1
-        return duchies
+        return player.owned["Duchy"]
 
 
 class Feodum(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Feodum", ["victory"], cost=4)
 
     def get_points(self, player: Player.Player):
-        silvers = 0
-        for card in player.stack():
-            if card.name == "Silver":
-                silvers += 1
-        return silvers // 3
+        return player.owned["Silver"] // 3
 
     def ontrash(
         self,
@@ -313,11 +377,13 @@ class Feodum(Card):
         mock: bool,
     ):
         for _ in range(3):
-            if len(game.supply["Silver"]) > 0:
-                player.discard.append(game.supply["Silver"].pop())
+            if game.supply["Silver"] > 0:
+                player.take_from_supply(game, "Silver")
 
 
 class Tunnel(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Tunnel", ["victory", "reaction"], cost=3, vpoints=2)
 
@@ -328,34 +394,41 @@ class Tunnel(Card):
         network: DominionNetwork,
         mock: bool,
     ):
-        if len(game.supply["Gold"]) > 0:
-            player.discard.append(game.supply["Gold"].pop())
+        if game.supply["Gold"] > 0:
+            player.take_from_supply(game, "Gold")
 
 
 class Silk_Road(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Silk Road", ["victory"], cost=4)
 
     def get_points(self, player: Player.Player):
         victory_cards = 0
-        for card in player.stack():
-            if "victory" in card.categories:
-                victory_cards += 1
+        for card_name, count in player.owned.items():
+            if CardNameMap[card_name].is_victory:
+                victory_cards += count
         return victory_cards // 4
 
 
 class Fairgrounds(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Fairgrounds", ["victory"], cost=6)
 
     def get_points(self, player: Player.Player):
-        card_names = set()
-        for card in player.stack():
-            card_names.add(card.name)
-        return 2 * len(card_names) // 5
+        different_cards = 0
+        for count in player.owned.values():
+            if count > 0:
+                different_cards += 1
+        return 2 * different_cards // 5
 
 
 class Farmland(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Farmland", ["victory"], cost=6, vpoints=2)
 
@@ -376,9 +449,8 @@ class Farmland(Card):
             )
             c = getcard(trashcard, game.supply, player.hand, "your hand")
             if c:
-                game.trash.append(c)
+                player.trash_card(game, c)
                 c.ontrash(player, game, network, mock)
-                player.hand.remove(c)
             else:
                 raise ValueError()
             player.gain_card(
@@ -387,6 +459,8 @@ class Farmland(Card):
 
 
 class Great_Hall(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(
             self,
@@ -400,6 +474,8 @@ class Great_Hall(Card):
 
 
 class Mill(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(
             self, "Mill", ["victory", "action"], cost=4, vpoints=1, draws=1, actions=1
@@ -418,9 +494,8 @@ class Mill(Card):
             )
             c = getcard(dis_card, game.supply, player.hand, "your hand")
             if c:
-                player.discard.append(c)
+                player.move_card(c, "hand", "discard")
                 c.ondiscard(player, game, network, mock)
-                player.hand.remove(c)
             else:
                 raise ValueError()
         player.purse += 2
@@ -452,6 +527,8 @@ class Mill(Card):
 
 
 class Nobles(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Nobles", ["victory", "action"], cost=6, vpoints=2)
 
@@ -492,31 +569,43 @@ class Nobles(Card):
 
 
 class Woodcutter(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Woodcutter", ["action"], cost=3, buys=1, coins=2)
 
 
 class Smithy(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Smithy", ["action"], cost=4, draws=3)
 
 
 class Laboratory(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Laboratory", ["action"], cost=5, actions=1, draws=2)
 
 
 class Village(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Village", ["action"], cost=3, actions=2, draws=1)
 
 
 class Festival(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Festival", ["action"], cost=5, actions=2, buys=1, coins=2)
 
 
 class Market(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(
             self, "Market", ["action"], cost=5, draws=1, actions=1, buys=1, coins=1
@@ -524,6 +613,8 @@ class Market(Card):
 
 
 class Chancellor(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Chancellor", ["action"], cost=3, coins=2)
 
@@ -531,8 +622,7 @@ class Chancellor(Card):
     def yes_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        player.discard = player.discard + player.deck
-        player.deck = []
+        player.move_all("deck", "discard")
         return 0
 
     @staticmethod
@@ -560,6 +650,8 @@ class Chancellor(Card):
 
 
 class Workshop(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Workshop", ["action"], cost=3)
 
@@ -575,6 +667,8 @@ class Workshop(Card):
 
 
 class Moneylender(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Moneylender", ["action"], cost=4)
 
@@ -592,13 +686,14 @@ class Moneylender(Card):
                 has_copper = True
         if has_copper:
             c = getcard("Copper", game.supply, player.hand, "your hand")
-            game.trash.append(c)
-            player.hand.remove(c)
+            player.trash_card(game, c)
             player.purse += 3
         return 0
 
 
 class Chapel(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Chapel", ["action"], cost=2)
 
@@ -623,9 +718,8 @@ class Chapel(Card):
                 break
             c = getcard(trashcard, game.supply, player.hand, "your hand")
             if c:
-                game.trash.append(c)
+                player.trash_card(game, c)
                 c.ontrash(player, game, network, mock)
-                player.hand.remove(c)
                 trashed += 1
             else:
                 raise ValueError()
@@ -633,6 +727,8 @@ class Chapel(Card):
 
 
 class Cellar(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Cellar", ["action"], cost=2, actions=1)
 
@@ -657,9 +753,8 @@ class Cellar(Card):
                 break
             c = getcard(dis_card, game.supply, player.hand, "your hand")
             if c:
-                player.discard.append(c)
+                player.move_card(c, "hand", "discard")
                 c.ondiscard(player, game, network, mock)
-                player.hand.remove(c)
                 discarded += 1
         for _ in range(discarded):
             if not mock:
@@ -668,6 +763,8 @@ class Cellar(Card):
 
 
 class Remodel(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Remodel", ["action"], cost=4)
 
@@ -688,8 +785,7 @@ class Remodel(Card):
             )
             if this_card:
                 c = getcard(this_card, game.supply, player.hand, "your hand")
-                game.trash.append(c)
-                player.hand.remove(c)
+                player.trash_card(game, c)
                 c.ontrash(player, game, network, mock)
                 player.gain_card(
                     game, network, c.cost + 2, mock=mock,
@@ -698,6 +794,8 @@ class Remodel(Card):
 
 
 class Adventurer(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Adventurer", ["action"], cost=6)
 
@@ -711,21 +809,22 @@ class Adventurer(Card):
         coins_added = 0
         if not mock:
             while (player.deck or player.discard) and coins_added < 2:
-                player.draw()
-                if "coin" in player.hand[-1].categories:
+                c = player.draw()
+                if c.is_coin:
                     coins_added += 1
                 else:
-                    player.aside.append(player.hand.pop())
+                    player.move_card(c, "hand", "aside")
         return 2
 
 
 class Feast(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Feast", ["action"], cost=4)
 
-    def use(self, player: Player.Player, trash: List[Card]):
-        trash.append(self)
-        player.hand.remove(self)
+    def use(self, player: Player.Player, game: Game.Game):
+        player.trash_card(game, self)
 
     def play(
         self,
@@ -739,6 +838,8 @@ class Feast(Card):
 
 
 class Mine(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Mine", ["action"], cost=5)
 
@@ -762,9 +863,8 @@ class Mine(Card):
             if this_card:
                 c = getcard(this_card, game.supply, player.hand, "your hand", ["coin"])
                 if c:
-                    game.trash.append(c)
+                    player.trash_card(game, c)
                     c.ontrash(player, game, network, mock)
-                    player.hand.remove(c)
                     player.gain_card(
                         game,
                         network,
@@ -779,6 +879,8 @@ class Mine(Card):
 
 
 class Library(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Library", ["action"], cost=5)
 
@@ -786,14 +888,14 @@ class Library(Card):
     def yes_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        player.aside.append(player.hold.pop())
+        player.move_card(player.hold[-1], "hold", "aside")
         return 0
 
     @staticmethod
     def no_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        player.hand.append(player.hold.pop())
+        player.move_card(player.hold[-1], "hold", "hand")
         return 0
 
     def play(
@@ -805,8 +907,8 @@ class Library(Card):
     ) -> int:
         if not mock:
             while (player.deck or player.discard) and len(player.hand) < 7:
-                player.draw(player.hold)
-                if "action" in player.hold[-1].categories:
+                player.draw("hold")
+                if player.hold[-1].is_action:
                     if player.yesnoinput(
                         "You drew "
                         + player.hold[-1].name
@@ -828,6 +930,8 @@ class Library(Card):
 
 
 class Moat(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Moat", ["action", "reaction"], cost=2, draws=2)
 
@@ -851,6 +955,8 @@ class Moat(Card):
 
 
 class Council_Room(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Council Room", ["action"], cost=5, draws=4, buys=1)
 
@@ -867,6 +973,8 @@ class Council_Room(Card):
 
 
 class Witch(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Witch", ["action", "attack"], cost=5, draws=2)
 
@@ -878,17 +986,19 @@ class Witch(Card):
         mock: bool,
     ) -> int:
         for player in players_around(game.players, this_player, inclusive=False):
-            if len(game.supply["Curse"]) > 0:
+            if game.supply["Curse"] > 0:
                 if not mock:
                     for c in player.hand:
                         if c.react(player, game, network, mock):
                             break
                 else:
-                    player.discard.append(game.supply["Curse"].pop())
+                    player.take_from_supply(game, "Curse")
         return 0
 
 
 class Bureaucrat(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Bureaucrat", ["action", "attack"], cost=4)
 
@@ -899,8 +1009,9 @@ class Bureaucrat(Card):
         network: DominionNetwork,
         mock: bool,
     ) -> int:
-        if len(game.supply["Silver"]) > 0:
-            this_player.deck.insert(0, game.supply["Silver"].pop())
+        if game.supply["Silver"] > 0:
+            # Gaining to the deck puts the card on top
+            this_player.take_from_supply(game, "Silver", "deck")
 
         for player in players_around(game.players, this_player, inclusive=False):
             for c in player.hand:
@@ -922,8 +1033,7 @@ class Bureaucrat(Card):
                         putback, game.supply, player.hand, "your hand", ["victory"]
                     )
                     if c:
-                        player.hand.remove(c)
-                        player.deck.insert(0, c)
+                        player.put_on_top(c)
                     else:
                         raise ValueError()
                 else:
@@ -932,6 +1042,8 @@ class Bureaucrat(Card):
 
 
 class Militia(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Militia", ["action", "attack"], cost=4, coins=2)
 
@@ -959,13 +1071,12 @@ class Militia(Card):
                             mock=mock,
                         )
 
-                        print("Discard " + dis_card)
+                        player.log.debug("attack", "Discard %s", dis_card)
                         if dis_card:
                             c = getcard(dis_card, game.supply, player.hand, "your hand")
                             if c:
-                                player.hand.remove(c)
+                                player.move_card(c, "hand", "discard")
                                 c.ondiscard(player, game, network, mock)
-                                player.discard.append(c)
                             else:
                                 raise ValueError()
 
@@ -976,6 +1087,8 @@ class Militia(Card):
 
 
 class Spy(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Spy", ["action", "attack"], cost=4, draws=1, actions=1)
 
@@ -983,14 +1096,14 @@ class Spy(Card):
     def yes_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        player.discard.append(player.hold.pop())
+        player.move_card(player.hold[-1], "hold", "discard")
         return 0
 
     @staticmethod
     def no_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        player.deck.insert(0, player.hold.pop())
+        player.put_on_top(player.hold[-1], "hold")
         return 0
 
     def play(
@@ -1005,15 +1118,14 @@ class Spy(Card):
                 if c.react(player, game, network, mock) or mock:
                     break
             else:
-                player.draw(player.hold)
+                player.draw("hold")
                 if len(player.hold) != 1:
                     continue
                 else:
                     this_player.hprint(
-                        "The first card in the deck of "
-                        + player.name
-                        + " is "
-                        + player.hold[0].name
+                        "The first card in the deck of %s is %s",
+                        player.name,
+                        player.hold[0].name,
                     )
                     if this_player.yesnoinput(
                         this_player.name
@@ -1035,6 +1147,8 @@ class Spy(Card):
 
 
 class Thief(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Thief", ["action", "attack"], cost=4)
 
@@ -1042,14 +1156,14 @@ class Thief(Card):
     def yes_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        player.discard.append(player.hold.pop())
+        player.move_card(player.hold[-1], "hold", "discard")
         return 0
 
     @staticmethod
     def no_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        game.trash.append(player.hold.pop())
+        player.trash_card(game, player.hold[-1], "hold")
         return 0
 
     def play(
@@ -1067,15 +1181,14 @@ class Thief(Card):
                         has_reaction = True
                 if not has_reaction:
                     for i in range(2):
-                        player.draw(player.hold)
+                        player.draw("hold")
 
                     coin_idx = []
                     for idx, card in enumerate(player.hold):
-                        if "coin" in card.categories:
+                        if card.is_coin:
                             coin_idx.append(idx)
                         else:
-                            player.hold.remove(card)
-                            player.discard.append(card)
+                            player.move_card(card, "hold", "discard")
 
                     # TODO: Make this a model decision
                     if len(coin_idx) == 2:
@@ -1086,14 +1199,12 @@ class Thief(Card):
                             mock=mock,
                         ):
                             c = player.hold[coin_idx[0]]
-                            player.hold.remove(c)
-                            player.discard.append(c)
+                            player.move_card(c, "hold", "discard")
                         else:
                             c = player.hold[coin_idx[1]]
-                            player.hold.remove(c)
-                            player.discard.append(c)
+                            player.move_card(c, "hold", "discard")
 
-                    this_player.hold.append(player.hold.pop())
+                    player.move_card(player.hold[-1], "hold", "hold", to=this_player)
 
                     if this_player.yesnoinput(
                         "Do you want to steal it?",
@@ -1108,12 +1219,13 @@ class Thief(Card):
                     else:
                         Thief.no_callback(this_player, game, network, mock)
 
-                    player.discard = player.discard + player.hold
-                    player.hold = []
+                    player.move_all("hold", "discard")
         return 0
 
 
 class Throne_Room(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Throne Room", ["action"], cost=4)
 
@@ -1129,7 +1241,7 @@ class Throne_Room(Card):
         choice = player.choose_action(game, network, mock=mock, optional=False)
         if choice:
             c = getcard(choice, game.supply, player.hand, " your hand", ["action"])
-            c.use(player, game.trash)
+            c.use(player, game)
             c.augment(player)
             d += c.play(player, game, network, mock)
             player.show()
@@ -1139,6 +1251,8 @@ class Throne_Room(Card):
 
 
 class Poacher(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Poacher", ["action"], cost=4, draws=1, actions=1, coins=1)
 
@@ -1151,7 +1265,7 @@ class Poacher(Card):
     ) -> int:
         empty_piles = 0
         for stack in game.supply:
-            if len(game.supply[stack]) == 0:
+            if game.supply[stack] == 0:
                 empty_piles += 1
 
         for _ in range(empty_piles):
@@ -1161,15 +1275,16 @@ class Poacher(Card):
                 )
                 c = getcard(dis_card, game.supply, player.hand, "your hand")
                 if c:
-                    player.hand.remove(c)
+                    player.move_card(c, "hand", "discard")
                     c.ondiscard(player, game, network, mock)
-                    player.discard.append(c)
                 else:
                     raise ValueError()
         return 0
 
 
 class Vassal(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Vassal", ["action"], cost=3, coins=2)
 
@@ -1177,8 +1292,8 @@ class Vassal(Card):
     def yes_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        card = player.hold.pop()
-        player.hand.append(card)
+        card = player.hold[-1]
+        player.move_card(card, "hold", "hand")
         card.augment(player)
         card.play(player, game, network, mock)
         return 0
@@ -1187,8 +1302,7 @@ class Vassal(Card):
     def no_callback(
         player: Player.Player, game: Game.Game, network: DominionNetwork, mock: bool
     ) -> int:
-        card = player.hold.pop()
-        player.discard.append(card)
+        player.move_card(player.hold[-1], "hold", "discard")
         return 0
 
     def play(
@@ -1199,10 +1313,10 @@ class Vassal(Card):
         mock: bool,
     ) -> int:
         if not mock:
-            b = player.draw(player.hold)
+            b = player.draw("hold")
             if not b:
                 return 0
-            if "action" in b.categories:
+            if b.is_action:
                 if player.yesnoinput(
                     "Would you like to play " + b.name,
                     game,
@@ -1217,6 +1331,8 @@ class Vassal(Card):
 
 
 class Artisan(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Artisan", ["action"], cost=6)
 
@@ -1238,12 +1354,13 @@ class Artisan(Card):
             mock=mock,
         )
         c = getcard(dis_card, game.supply, player.hand, "your hand")
-        player.hand.remove(c)
-        player.deck.insert(0, c)
+        player.put_on_top(c)
         return 0
 
 
 class Courtyard(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Courtyard", ["action"], cost=2, draws=3)
 
@@ -1263,12 +1380,13 @@ class Courtyard(Card):
                 mock=mock,
             )
             c = getcard(dis_card, game.supply, player.hand, "your hand")
-            player.hand.remove(c)
-            player.deck.insert(0, c)
+            player.put_on_top(c)
         return 0
 
 
 class Shanty_Town(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Shanty Town", ["action"], cost=3, actions=2)
 
@@ -1288,6 +1406,8 @@ class Shanty_Town(Card):
 
 
 class Baron(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Baron", ["action"], cost=4, buys=1)
 
@@ -1297,8 +1417,7 @@ class Baron(Card):
     ) -> int:
         c = getcard("Estate", game.supply, player.hand, "your hand")
         if c:
-            player.hand.remove(c)
-            player.discard.append(c)
+            player.move_card(c, "hand", "discard")
             player.purse += 4
         return 0
 
@@ -1331,13 +1450,15 @@ class Baron(Card):
                     break
 
         if not discarded:
-            if len(game.supply["Estate"]) > 0:
-                player.discard.append(game.supply["Estate"].pop())
+            if game.supply["Estate"] > 0:
+                player.take_from_supply(game, "Estate")
 
         return 0
 
 
 class Conspirator(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Conspirator", ["action"], cost=4, coins=2)
 
@@ -1357,6 +1478,8 @@ class Conspirator(Card):
 
 
 class Ironworks(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Ironworks", ["action"], cost=4)
 
@@ -1371,11 +1494,11 @@ class Ironworks(Card):
         c = CardNameMap[card]
 
         drawn = 0
-        if "action" in c.categories:
+        if c.is_action:
             player.actions += 1
-        if "coin" in c.categories:
+        if c.is_coin:
             player.purse += 1
-        if "victory" in c.categories:
+        if c.is_victory:
             drawn += 1
             if not mock:
                 player.draw()
@@ -1383,6 +1506,8 @@ class Ironworks(Card):
 
 
 class Mining_Village(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Mining Village", ["action"], cost=4, actions=1, draws=2)
 
@@ -1399,8 +1524,7 @@ class Mining_Village(Card):
             return 0
 
         c = getcard("Mining Village", game.supply, player.played, "your hand")
-        game.trash.append(c)
-        player.played.remove(c)
+        player.trash_card(game, c, "played")
         player.purse += 1
         return 0
 
@@ -1432,6 +1556,8 @@ class Mining_Village(Card):
 
 
 class Upgrade(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Upgrade", ["action"], cost=5, actions=1, draws=1)
 
@@ -1452,8 +1578,7 @@ class Upgrade(Card):
             )
             if this_card:
                 c = getcard(this_card, game.supply, player.hand, "your hand")
-                game.trash.append(c)
-                player.hand.remove(c)
+                player.trash_card(game, c)
                 c.ontrash(player, game, network, mock)
                 player.gain_card(
                     game, network, c.cost + 1, exact=True, mock=mock,
@@ -1462,6 +1587,8 @@ class Upgrade(Card):
 
 
 class Trading_Post(Card):
+    __slots__ = ()
+
     def __init__(self):
         Card.__init__(self, "Trading Post", ["action"], cost=5)
 
@@ -1483,13 +1610,12 @@ class Trading_Post(Card):
             )
             if this_card:
                 c = getcard(this_card, game.supply, player.hand, "your hand")
-                game.trash.append(c)
-                player.hand.remove(c)
+                player.trash_card(game, c)
                 c.ontrash(player, game, network, mock)
                 trashed += 1
 
-        if len(game.supply["Silver"]) > 0:
-            player.hand.append(game.supply["Silver"].pop())
+        if game.supply["Silver"] > 0:
+            player.take_from_supply(game, "Silver", "hand")
 
         return 0
 
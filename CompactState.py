@@ -0,0 +1,167 @@
+from __future__ import annotations
+import numpy as np
+from collections import Counter
+from typing import List
+
+import Game
+import Player
+import Card
+
+DECK = Player.Player.zones.index("deck")
+HAND = Player.Player.zones.index("hand")
+DISCARD = Player.Player.zones.index("discard")
+
+# Card objects by CardIndexMap index, used when expanding counts back into zones
+IndexedCards: List[Card.Card] = [
+    Card.CardNameMap[card_name] for card_name in Card.CardIndexMap
+]
+VictoryCards = np.array(
+    [card.is_victory or card.is_curse for card in IndexedCards], dtype=bool
+)
+
+
+class CompactPlayerState:
+    # One player's position as arrays: int16 card counts per zone indexed by
+    # CardIndexMap, the deck in order (bottom to top, like Player.deck) and the
+    # turn counters in Player.counter_fields order.
+    __slots__ = ("zones", "deck", "counters")
+
+    def __init__(self, zones: np.ndarray, deck: np.ndarray, counters: np.ndarray):
+        self.zones = zones
+        self.deck = deck
+        self.counters = counters
+
+    @staticmethod
+    def from_player(player: Player.Player) -> CompactPlayerState:
+        index = Card.CardIndexMap
+        zones = np.zeros((len(Player.Player.zones), len(index)), dtype=np.int16)
+        for zone, counts in enumerate(
+            player.zone_counts[zone_name] for zone_name in Player.Player.zones
+        ):
+            for card_name, count in counts.items():
+                if count:
+                    zones[zone, index[card_name]] = count
+        deck = np.fromiter(
+            (index[card.name] for card in player.deck),
+            dtype=np.int8,
+            count=len(player.deck),
+        )
+        counters = np.array(player.get_counters(), dtype=np.int32)
+        return CompactPlayerState(zones, deck, counters)
+
+    def apply_to(self, player: Player.Player):
+        for zone, zone_name in enumerate(Player.Player.zones):
+            if zone == DECK:
+                cards = [IndexedCards[idx] for idx in self.deck]
+            else:
+                cards = [
+                    IndexedCards[idx]
+                    for idx in np.repeat(
+                        np.arange(len(IndexedCards)), self.zones[zone]
+                    )
+                ]
+            setattr(player, zone_name, cards)
+            player.zone_counts[zone_name] = Counter(card.name for card in cards)
+        view = OwnedView(self.owned())
+        player.owned = view.owned
+        player.num_cards = view.num_cards
+        player.cached_points = None
+        player.set_counters(tuple(int(value) for value in self.counters))
+
+    def copy(self) -> CompactPlayerState:
+        return CompactPlayerState(
+            self.zones.copy(), self.deck.copy(), self.counters.copy()
+        )
+
+    def owned(self) -> np.ndarray:
+        return self.zones.sum(axis=0)
+
+    def calcpoints(self) -> int:
+        owned = self.owned()
+        view = OwnedView(owned)
+        vp = 0
+        for idx in np.flatnonzero(owned * VictoryCards):
+            vp += int(owned[idx]) * IndexedCards[idx].get_points(view)
+        return vp
+
+
+class OwnedView:
+    # The part of the Player interface that Card.get_points reads
+    def __init__(self, owned: np.ndarray):
+        self.owned = Counter(
+            {IndexedCards[idx].name: int(owned[idx]) for idx in np.flatnonzero(owned)}
+        )
+        self.num_cards = int(owned.sum())
+
+
+class CompactGameState:
+    # A whole game as a handful of arrays, for holding many live games at once.
+    # Copying one is a few array copies. Kingdom lists the supply piles in the
+    # order of Game.supply, which the state encoder relies on.
+    __slots__ = ("supply", "kingdom", "trash", "turns", "players")
+
+    def __init__(
+        self,
+        supply: np.ndarray,
+        kingdom: np.ndarray,
+        trash: np.ndarray,
+        turns: int,
+        players: List[CompactPlayerState],
+    ):
+        self.supply = supply
+        self.kingdom = kingdom
+        self.trash = trash
+        self.turns = turns
+        self.players = players
+
+    @staticmethod
+    def from_game(game: Game.Game) -> CompactGameState:
+        index = Card.CardIndexMap
+        supply = np.zeros(len(index), dtype=np.int16)
+        for card_name, count in game.supply.items():
+            supply[index[card_name]] = count
+        kingdom = np.fromiter(
+            (index[card_name] for card_name in game.supply),
+            dtype=np.int8,
+            count=len(game.supply),
+        )
+        trash = np.zeros(len(index), dtype=np.int16)
+        for card_name, count in game.trash_counts.items():
+            if count:
+                trash[index[card_name]] = count
+        return CompactGameState(
+            supply,
+            kingdom,
+            trash,
+            game.turns,
+            [CompactPlayerState.from_player(player) for player in game.players],
+        )
+
+    def apply_to(self, game: Game.Game):
+        # Overwrites the position held by an existing game and its players,
+        # keeping their types, networks and settings
+        game.supply = {
+            IndexedCards[idx].name: int(self.supply[idx]) for idx in self.kingdom
+        }
+        game.trash = [
+            IndexedCards[idx]
+            for idx in np.repeat(np.arange(len(IndexedCards)), self.trash)
+        ]
+        game.trash_counts = Counter(card.name for card in game.trash)
+        game.turns = self.turns
+        for player, state in zip(game.players, self.players):
+            state.apply_to(player)
+
+    def to_game(self, template: Game.Game) -> Game.Game:
+        game = template.clone()
+        self.apply_to(game)
+        return game
+
+    def copy(self) -> CompactGameState:
+        return CompactGameState(
+            self.supply.copy(),
+            self.kingdom,
+            self.trash.copy(),
+            self.turns,
+            [player.copy() for player in self.players],
+        )
@@ -1,37 +1,144 @@
-from __future__ import annotations
-import random
-from typing import List, Dict
-
-import Game
-import Player
-from nn.network import Network
-from nn.network_definition import DominionNetwork
-from nn.network_definition_no_rnn import DominionNetworkNoRecurrent
-
-
-if __name__ == "__main__":
-    network = DominionNetwork()
-
-    for idx in range(10000):
-        print("Game number " + str(idx))
-
-        names = random.choice(
-            [["*Alex", "*Ben"], ["*Alex", "+Ben"], ["+Alex", "*Ben"]]
-        )
-
-        players: List[Player.Player] = []
-        networks: Dict[str, Network] = {}
-
-        for play_order, name in enumerate(names):
-            if name[0] == "*":
-                players.append(Player.ComputerPlayer(name[1:], play_order))
-            elif name[0] == "^":
-                players.append(Player.QvistPlayer(name[1:], play_order))
-            elif name[0] == "+":
-                players.append(Player.NNPlayer(name[1:], play_order, game_index=idx))
-            else:
-                players.append(Player.Player(name, play_order))
-            networks[name[1:]] = random.choice([network])
-
-        game = Game.Game(players)
-        game.play_game(networks)
+from __future__ import annotations
+import argparse
+
+import Log
+from SelfPlay import SelfPlayRunner, play_concurrent_games, play_one_game
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument(
+        "--players",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help="play every game with these players in seat order; the first "
+        "character picks the type: * computer, ^ Qvist, + network, # MCTS, "
+        "%% rollout",
+    )
+    parser.add_argument(
+        "--concurrent-games",
+        type=int,
+        default=1,
+        help="games played at once, sharing one batched inference server",
+    )
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=5.0,
+        help="longest a position waits for the batch to fill",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="self-play worker processes; the main process becomes the learner",
+    )
+    parser.add_argument(
+        "--games-per-worker",
+        type=int,
+        default=None,
+        help="defaults to --games split evenly across the workers",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--sync-every",
+        type=int,
+        default=10,
+        help="games between pushing the learner's weights to the workers",
+    )
+    parser.add_argument("--train-batch-size", type=int, default=32)
+    parser.add_argument(
+        "--replay-ratio",
+        type=float,
+        default=1.0,
+        help="expected number of times each recorded state is trained on",
+    )
+    parser.add_argument("--replay-capacity", type=int, default=100000)
+    parser.add_argument(
+        "--checkpoint-games",
+        type=int,
+        default=100,
+        help="games between checkpoints, 0 to disable",
+    )
+    parser.add_argument(
+        "--checkpoint-seconds",
+        type=float,
+        default=600.0,
+        help="seconds between checkpoints, 0 to disable",
+    )
+    parser.add_argument(
+        "--checkpoint-on-improvement",
+        action="store_true",
+        help="also checkpoint whenever the training loss reaches a new best",
+    )
+    parser.add_argument(
+        "--weights-only",
+        action="store_true",
+        help="leave the optimizer state out of checkpoints",
+    )
+    parser.add_argument(
+        "--keep-checkpoints",
+        type=int,
+        default=0,
+        help="numbered checkpoints to keep besides the latest",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=sorted(Log.LevelNames, key=Log.LevelNames.get),
+        default="info",
+        help="debug logs every decision; off runs headless",
+    )
+    args = parser.parse_args()
+    if args.workers > 1 and args.concurrent_games > 1:
+        parser.error("--concurrent-games cannot be combined with --workers")
+    Log.default.level = Log.LevelNames[args.log_level]
+
+    # Keras is only loaded once the arguments are known to be valid
+    from nn.network_definition import DominionNetwork
+    from nn.checkpoint import Checkpointer
+    from nn.replay_buffer import ReplayBuffer
+
+    network = DominionNetwork()
+    network.replay = ReplayBuffer(
+        capacity=args.replay_capacity,
+        batch_size=args.train_batch_size,
+        replay_ratio=args.replay_ratio,
+    )
+    network.checkpointer = Checkpointer(
+        every_games=args.checkpoint_games or None,
+        every_seconds=args.checkpoint_seconds or None,
+        on_improvement=args.checkpoint_on_improvement,
+        weights_only=args.weights_only,
+        keep=args.keep_checkpoints,
+    )
+
+    lineups = [args.players] if args.players else None
+    if args.workers > 1:
+        games_per_worker = args.games_per_worker
+        if games_per_worker is None:
+            games_per_worker = -(-args.games // args.workers)
+        SelfPlayRunner(
+            network,
+            args.workers,
+            games_per_worker,
+            seed=args.seed,
+            sync_every=args.sync_every,
+            lineups=lineups,
+        ).run()
+    elif args.concurrent_games > 1:
+        play_concurrent_games(
+            network,
+            args.games,
+            args.concurrent_games,
+            args.max_batch_size,
+            args.max_wait_ms / 1000,
+            lineups,
+        )
+    else:
+        for idx in range(args.games):
+            play_one_game(idx, network, lineups)
+    # Whichever mode ran, the games since the last checkpoint are saved here
+    network.checkpointer.finish(network)
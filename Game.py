@@ -1,23 +1,34 @@
 from __future__ import annotations
 import random
-import pandas
+from contextlib import contextmanager
 import numpy as np
-from collections import defaultdict
-from typing import Dict, List, DefaultDict, Tuple
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple
 
 import Player
 import Card
-from utils import players_around, getcard
-from nn.network_definition import DominionNetwork
+import Journal
+import Log
+import StateEncoder
+from utils import namesinlist, players_around, getcard
+
+if TYPE_CHECKING:
+    from nn.network_definition import DominionNetwork
 
 
 class Game:
-    def __init__(self, players: List[Player.Player], verbose: bool = True):
+    def __init__(self, players: List[Player.Player], log: Log.Logger = None):
         self.players = players
         self.trash: List[Card.Card] = []
+        self.trash_counts: Counter = Counter()
         self.supply = self.setup_supply()
         self.supply_order: Dict[int, List[str]] = {}
-        self.verbose = verbose
+        self.log = log if log is not None else Log.default
+        self.journal = Journal.Journal()
+        self.encoder = StateEncoder.StateEncoder()
+        for player in self.players:
+            player.journal = self.journal
+            player.log = self.log
 
         for card_name in Card.CardNameMap:
             card = Card.CardNameMap[card_name]
@@ -27,8 +38,27 @@ class Game:
                 self.supply_order[card.cost] = [card_name]
 
         self.turns = 0
-
-    def setup_supply(self) -> DefaultDict[str, List[Card.Card]]:
+        self.decision_point: str = None
+
+    def clone(self) -> Game:
+        # Independent copy of the current position for rollouts. Only the
+        # containers are copied; Card instances, the supply order, the log and
+        # the encoder's scratch table are shared. The copy starts with its own
+        # empty journal.
+        other = object.__new__(Game)
+        other.__dict__.update(self.__dict__)
+        other.players = [player.clone() for player in self.players]
+        other.trash = list(self.trash)
+        other.trash_counts = Counter(self.trash_counts)
+        other.supply = dict(self.supply)
+        other.journal = Journal.Journal()
+        for player in other.players:
+            player.journal = other.journal
+        return other
+
+    def setup_supply(self) -> Dict[str, int]:
+        # Pile sizes by card name; the cards themselves are the shared
+        # instances in Card.CardNameMap
         if len(self.players) > 2:
             nV = 12
         else:
@@ -36,57 +66,57 @@ class Game:
         nC = -10 + 10 * len(self.players)
 
         # Define box
-        box: Dict[str, List[Card.Card]] = {}
-        box["Woodcutter"] = [Card.Woodcutter()] * 10
-        box["Smithy"] = [Card.Smithy()] * 10
-        box["Laboratory"] = [Card.Laboratory()] * 10
-        box["Village"] = [Card.Village()] * 10
-        box["Festival"] = [Card.Festival()] * 10
-        box["Market"] = [Card.Market()] * 10
-        box["Chancellor"] = [Card.Chancellor()] * 10
-        box["Workshop"] = [Card.Workshop()] * 10
-        box["Moneylender"] = [Card.Moneylender()] * 10
-        box["Chapel"] = [Card.Chapel()] * 10
-        box["Cellar"] = [Card.Cellar()] * 10
-        box["Remodel"] = [Card.Remodel()] * 10
-        box["Adventurer"] = [Card.Adventurer()] * 10
-        box["Feast"] = [Card.Feast()] * 10
-        box["Mine"] = [Card.Mine()] * 10
-        box["Library"] = [Card.Library()] * 10
-        box["Gardens"] = [Card.Gardens()] * nV
-        box["Moat"] = [Card.Moat()] * 10
-        box["Council Room"] = [Card.Council_Room()] * 10
-        box["Witch"] = [Card.Witch()] * 10
-        box["Bureaucrat"] = [Card.Bureaucrat()] * 10
-        box["Militia"] = [Card.Militia()] * 10
-        box["Spy"] = [Card.Spy()] * 10
-        # box["Thief"] = [Card.Thief()] * 10
-        box["Throne Room"] = [Card.Throne_Room()] * 10
-        box["Duke"] = [Card.Duke()] * nV
-        box["Poacher"] = [Card.Poacher()] * 10
-        box["Vassal"] = [Card.Vassal()] * 10
-        box["Artisan"] = [Card.Artisan()] * 10
-        box["Courtyard"] = [Card.Courtyard()] * 10
-        box["Shanty Town"] = [Card.Shanty_Town()] * 10
-        box["Baron"] = [Card.Baron()] * 10
-        box["Ill-Gotten Gains"] = [Card.IllGottenGains()] * 10
-        box["Treasure Trove"] = [Card.Treasure_Trove()] * 10
-        box["Cache"] = [Card.Cache()] * 10
-        box["Harem"] = [Card.Harem()] * nV
-        box["Feodum"] = [Card.Feodum()] * nV
-        box["Tunnel"] = [Card.Tunnel()] * nV
-        box["Silk Road"] = [Card.Silk_Road()] * nV
-        box["Fairgrounds"] = [Card.Fairgrounds()] * nV
-        box["Farmland"] = [Card.Farmland()] * nV
-        box["Great Hall"] = [Card.Great_Hall()] * nV
-        box["Mill"] = [Card.Mill()] * nV
-        box["Bank"] = [Card.Bank()] * 10
-        box["Conspirator"] = [Card.Conspirator()] * 10
-        box["Ironworks"] = [Card.Ironworks()] * 10
-        box["Mining Village"] = [Card.Mining_Village()] * 10
-        box["Nobles"] = [Card.Nobles()] * nV
-        box["Upgrade"] = [Card.Upgrade()] * 10
-        box["Trading Post"] = [Card.Trading_Post()] * 10
+        box: Dict[str, int] = {}
+        box["Woodcutter"] = 10
+        box["Smithy"] = 10
+        box["Laboratory"] = 10
+        box["Village"] = 10
+        box["Festival"] = 10
+        box["Market"] = 10
+        box["Chancellor"] = 10
+        box["Workshop"] = 10
+        box["Moneylender"] = 10
+        box["Chapel"] = 10
+        box["Cellar"] = 10
+        box["Remodel"] = 10
+        box["Adventurer"] = 10
+        box["Feast"] = 10
+        box["Mine"] = 10
+        box["Library"] = 10
+        box["Gardens"] = nV
+        box["Moat"] = 10
+        box["Council Room"] = 10
+        box["Witch"] = 10
+        box["Bureaucrat"] = 10
+        box["Militia"] = 10
+        box["Spy"] = 10
+        # box["Thief"] = 10
+        box["Throne Room"] = 10
+        box["Duke"] = nV
+        box["Poacher"] = 10
+        box["Vassal"] = 10
+        box["Artisan"] = 10
+        box["Courtyard"] = 10
+        box["Shanty Town"] = 10
+        box["Baron"] = 10
+        box["Ill-Gotten Gains"] = 10
+        box["Treasure Trove"] = 10
+        box["Cache"] = 10
+        box["Harem"] = nV
+        box["Feodum"] = nV
+        box["Tunnel"] = nV
+        box["Silk Road"] = nV
+        box["Fairgrounds"] = nV
+        box["Farmland"] = nV
+        box["Great Hall"] = nV
+        box["Mill"] = nV
+        box["Bank"] = 10
+        box["Conspirator"] = 10
+        box["Ironworks"] = 10
+        box["Mining Village"] = 10
+        box["Nobles"] = nV
+        box["Upgrade"] = 10
+        box["Trading Post"] = 10
 
         supply_order: Dict[int, List[str]] = {}
 
@@ -101,390 +131,213 @@ class Game:
         boxlist = [k for k in box]
         random.shuffle(boxlist)
         random10 = boxlist[:10]
-        supply = defaultdict(list, [(k, box[k]) for k in random10])
+        supply = {k: box[k] for k in random10}
 
         # The supply always has these cards
-        supply["Copper"] = [Card.Copper()] * (60 - len(self.players) * 7)
-        supply["Silver"] = [Card.Silver()] * 40
-        supply["Gold"] = [Card.Gold()] * 30
-        supply["Estate"] = [Card.Estate()] * nV
-        supply["Duchy"] = [Card.Duchy()] * nV
-        supply["Province"] = [Card.Province()] * nV
-        supply["Curse"] = [Card.Curse()] * nC
+        supply["Copper"] = 60 - len(self.players) * 7
+        supply["Silver"] = 40
+        supply["Gold"] = 30
+        supply["Estate"] = nV
+        supply["Duchy"] = nV
+        supply["Province"] = nV
+        supply["Curse"] = nC
 
         return supply
 
-    @staticmethod
-    def count_cards_in_pile(card_name: str, pile: List[Card.Card]) -> int:
-        count = 0
-        for card in pile:
-            if card.name == card_name:
-                count += 1
-        return count
+    @contextmanager
+    def lookahead(self) -> Iterator[Game]:
+        # Hypothetical moves are applied in place and rolled back on exit
+        mark = self.journal.checkpoint(self.players)
+        try:
+            yield self
+        finally:
+            self.journal.rollback(mark)
 
     @staticmethod
-    def gameover(supply: DefaultDict[str, List[Card.Card]]):
-        if len(supply["Province"]) == 0:
+    def gameover(supply: Dict[str, int], log: Log.Logger = None):
+        if supply["Province"] == 0:
             return True
-        out = 0
-        for stack in supply:
-            if len(supply[stack]) == 0:
-                out += 1
-                print(str(stack) + " is out!")
-        if out >= 3:
-            return True
-        return False
+        out = list(supply.values()).count(0)
+        if log is not None and out > 0 and log.enabled(Log.DEBUG):
+            for stack, count in supply.items():
+                if count == 0:
+                    log.debug("supply", "%s is out!", stack)
+        return out >= 3
 
     @staticmethod
-    def cardsummaries(players: List[Player.Player]) -> pandas.DataFrame:
+    def cardsummaries(players: List[Player.Player]):
+        # Only the debug reports here and in supply_report use pandas, so it
+        # is imported on first use
+        import pandas
+
         cardsums = {}
         for player in players:
             cardsums[player.name] = player.cardsummary()
         return pandas.DataFrame(cardsums).fillna(0).astype(int)
 
-    def get_card_features(self, card_name: str, player: Player.Player,) -> List[float]:
-
-        card = Card.CardNameMap[card_name]
-
-        cost = float(card.cost) / 8
-        vpoints = float(card.get_points(player)) / 6
-        is_victory = float("victory" in card.categories)
-        is_action = float("action" in card.categories)
-        is_coin = float("coin" in card.categories)
-        is_attack = float("attack" in card.categories)
-        is_reaction = float("reaction" in card.categories)
-        is_duration = float("duration" in card.categories)
-
-        supply_left = float(len(self.supply[card_name])) / 10
-        player_deck_count = float(Game.count_cards_in_pile(card_name, player.deck)) / 10
-        player_discard_count = (
-            float(Game.count_cards_in_pile(card_name, player.discard)) / 10
+    def supply_table(self) -> Tuple[List[str], List[int], List[int]]:
+        names: List[str] = []
+        costs: List[int] = []
+        remaining: List[int] = []
+        for value in self.supply_order:
+            for stack in self.supply_order[value]:
+                if stack in self.supply:
+                    names.append(stack)
+                    costs.append(value)
+                    remaining.append(self.supply[stack])
+        return names, costs, remaining
+
+    def supply_report(self):
+        import pandas
+
+        names, costs, remaining = self.supply_table()
+        return pandas.DataFrame(
+            data={"Cost": costs, "Remaining": remaining}, index=names
         )
 
-        opponent_discards = [0.0, 0.0, 0.0]
-        opponent_decks = [0.0, 0.0, 0.0]
-        for idx, opponent in enumerate(
-            players_around(self.players, player, inclusive=False)
-        ):
-            opponent_discards[idx] = (
-                float(Game.count_cards_in_pile(card_name, opponent.discard)) / 10
-            )
-            opponent_decks[idx] = (
-                float(Game.count_cards_in_pile(card_name, opponent.stack())) / 10
-            )
-
-        player_hand_count = float(Game.count_cards_in_pile(card_name, player.hand)) / 10
-        trash_count = float(Game.count_cards_in_pile(card_name, self.trash)) / 10
-
-        return [
-            cost,
-            vpoints,
-            is_victory,
-            is_action,
-            is_coin,
-            is_attack,
-            is_reaction,
-            is_duration,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
-            supply_left,
-            player_deck_count,
-            player_discard_count,
-            player_hand_count,
-            opponent_discards[0],
-            opponent_discards[1],
-            opponent_discards[2],
-            opponent_decks[0],
-            opponent_decks[1],
-            opponent_decks[2],
-            trash_count,
-        ]
-
     def get_game_state(
         self, player: Player.Player, cards_to_draw: int = 0,
     ) -> Tuple[
-        List[List[float]],
-        List[int],
-        List[List[float]],
-        List[int],
-        List[List[float]],
-        List[float],
+        np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray,
     ]:
-
-        opponent_states: List[List[float]] = []
-
-        for opponent in players_around(self.players, player, inclusive=False):
-            opponent_states.append(
-                [
-                    float(len(opponent.deck)) / 40,
-                    float(len(opponent.discard)) / 40,
-                    float(len(opponent.hand)) / 5,
-                    float(opponent.calcpoints()) / 30,
-                    float(opponent.our_turn),
-                ]
-            )
-
-        hand_state: List[List[float]] = []
-        hand_one_hot: List[int] = []
-
-        for card in player.hand:
-            hand_state.append(self.get_card_features(card.name, player))
-            hand_one_hot.append(Card.CardIndexMap[card.name])
-
-        kingdom_state: List[List[float]] = []
-        kingdom_one_hot: List[int] = []
-
-        for card_name in self.supply:
-            kingdom_state.append(self.get_card_features(card_name, player))
-            kingdom_one_hot.append(Card.CardIndexMap[card_name])
-
-        game_state = [
-            float(player.actions),
-            float(player.buys),
-            float(self.turns) / 20,
-            float(cards_to_draw) / 5,
-            float(player.purse) / 8,
-            float(player.our_turn),
-            float(len(player.deck)) / 40,
-            float(len(player.discard)) / 40,
-            float(len(player.hand)) / 5,
-            float(player.calcpoints()) / 30,
-        ]
-
-        return (
-            hand_state,
-            hand_one_hot,
-            kingdom_state,
-            kingdom_one_hot,
-            opponent_states,
-            game_state,
-        )
+        return self.encoder.encode(self, player, cards_to_draw)
 
     def take_turn(self, player: Player.Player, network: DominionNetwork):
         player.start_turn()
 
-        print(player.name + "'s turn")
+        log = self.log
+        log.debug("turn", "%s's turn", player.name)
+        if log.enabled(Log.DEBUG):
+            log.debug("turn", "Starting hand: %s", ", ".join(namesinlist(player.hand)))
 
-        print("Starting hand")
-        for c in player.hand:
-            print(c.name)
+        self.action_phase(player, network)
+        self.treasure_phase(player, network)
+        self.buy_phase(player, network)
+
+        player.cleanup()
 
-        # Action phase
+    # The phases below are also used on their own to finish a turn that was
+    # started elsewhere, e.g. by a search player simulating its options.
+    # decision_point names the turn-level decision being asked for, so players
+    # can tell it apart from the same choice asked by a card being played.
+
+    def play_action(
+        self, player: Player.Player, card_name: str, network: DominionNetwork
+    ):
+        self.log.debug("action", "Playing %s", card_name)
+        c = getcard(card_name, self.supply, player.hand, "your hand", ["action"])
+        player.playcard(c, self, network)
+        player.actions_played += 1
+
+    def action_phase(self, player: Player.Player, network: DominionNetwork):
         while player.actions > 0:
+            self.decision_point = "action"
             move_to_play = player.choose_action(self, network)
+            self.decision_point = None
             if move_to_play:
-                print("Playing " + move_to_play)
-                c = getcard(
-                    move_to_play, self.supply, player.hand, "your hand", ["action"]
-                )
-                player.playcard(c, self, network)
-                player.actions_played += 1
+                self.play_action(player, move_to_play, network)
                 if player.type != "neural_network":
-                    board_state = self.get_game_state(player)
-                    hand = board_state[0]
-                    if len(hand) == 0:
-                        print("Empty hand")
-                        hand = np.zeros((1, 33))
-
-                    hand_one_hot = board_state[1]
-                    if len(hand_one_hot) == 0:
-                        hand_one_hot = [0]
-
-                    player.current_game_hand_states.append(hand)
-                    player.current_game_hand_one_hot.append(hand_one_hot)
-                    player.current_game_kingdom_states.append(board_state[2])
-                    player.current_game_kingdom_one_hot.append(board_state[3])
-                    player.current_game_opponent_states.append(board_state[4])
-                    player.current_game_states.append(board_state[5])
+                    player.record_state(self.get_game_state(player))
             else:
                 player.actions = 0
                 if player.type != "neural_network":
-                    board_state = self.get_game_state(player)
-                    hand = board_state[0]
-                    if len(hand) == 0:
-                        print("Empty hand")
-                        hand = np.zeros((1, 33))
-
-                    hand_one_hot = board_state[1]
-                    if len(hand_one_hot) == 0:
-                        hand_one_hot = [0]
-
-                    player.current_game_hand_states.append(hand)
-                    player.current_game_hand_one_hot.append(hand_one_hot)
-                    player.current_game_kingdom_states.append(board_state[2])
-                    player.current_game_kingdom_one_hot.append(board_state[3])
-                    player.current_game_opponent_states.append(board_state[4])
-                    player.current_game_states.append(board_state[5])
+                    player.record_state(self.get_game_state(player))
                 break
 
-        print("Hand after playing actions")
-        for c in player.hand:
-            print(c.name)
+        if self.log.enabled(Log.DEBUG):
+            self.log.debug(
+                "turn",
+                "Hand after playing actions: %s",
+                ", ".join(namesinlist(player.hand)),
+            )
 
-        # Play treasures
-        while len(player.hand) > 0:
+    def treasure_phase(self, player: Player.Player, network: DominionNetwork):
+        if player.autoplay_treasures and player.play_plain_treasures(self, network):
+            player.record_state(self.get_game_state(player))
+        while any(card.is_coin for card in player.hand):
             to_play = player.choose_treasure(self, network)
             if to_play:
-                print("Using " + to_play)
+                self.log.debug("treasure", "Using %s", to_play)
                 c = getcard(to_play, self.supply, player.hand, "your hand", ["coin"])
                 c.onuse(player, self, network, mock=False)
-                player.hand.remove(c)
-                player.played.append(c)
+                player.move_card(c, "hand", "played")
                 player.treasures_played += 1
 
                 if player.type != "neural_network":
-                    board_state = self.get_game_state(player)
-                    hand = board_state[0]
-                    if len(hand) == 0:
-                        print("Empty hand")
-                        hand = np.zeros((1, 33))
-
-                    hand_one_hot = board_state[1]
-                    if len(hand_one_hot) == 0:
-                        hand_one_hot = [0]
-
-                    player.current_game_hand_states.append(hand)
-                    player.current_game_hand_one_hot.append(hand_one_hot)
-                    player.current_game_kingdom_states.append(board_state[2])
-                    player.current_game_kingdom_one_hot.append(board_state[3])
-                    player.current_game_opponent_states.append(board_state[4])
-                    player.current_game_states.append(board_state[5])
+                    player.record_state(self.get_game_state(player))
             else:
                 if player.type != "neural_network":
-                    board_state = self.get_game_state(player)
-                    hand = board_state[0]
-                    if len(hand) == 0:
-                        print("Empty hand")
-                        hand = np.zeros((1, 33))
-
-                    hand_one_hot = board_state[1]
-                    if len(hand_one_hot) == 0:
-                        hand_one_hot = [0]
-
-                    player.current_game_hand_states.append(hand)
-                    player.current_game_hand_one_hot.append(hand_one_hot)
-                    player.current_game_kingdom_states.append(board_state[2])
-                    player.current_game_kingdom_one_hot.append(board_state[3])
-                    player.current_game_opponent_states.append(board_state[4])
-                    player.current_game_states.append(board_state[5])
+                    player.record_state(self.get_game_state(player))
                 break
 
-        print("Hand after playing treasures")
-        for c in player.hand:
-            print(c.name)
+        if self.log.enabled(Log.DEBUG):
+            self.log.debug(
+                "turn",
+                "Hand after playing treasures: %s",
+                ", ".join(namesinlist(player.hand)),
+            )
 
-        # Buy phase
-        print("Total coins: " + str(player.purse))
+    def buy_card(
+        self, player: Player.Player, card_name: str, network: DominionNetwork
+    ):
+        c = getcard(card_name, self.supply, upto=player.purse)
+        self.log.debug("buy", "Purchased %s", card_name)
+        player.take_from_supply(self, card_name)
+        player.buys = player.buys - 1
+        player.purse = player.purse - c.cost
+        player.cprint("%s bought %s. ", player.name, c.name)
+        c.ongain(player, self, network, mock=False)
+        c.onbuy(player, self, network, mock=False)
+        player.cards_bought += 1
+
+    def buy_phase(self, player: Player.Player, network: DominionNetwork):
+        self.log.debug("buy", "Total coins: %d", player.purse)
         while player.buys > 0:
+            self.decision_point = "buy"
             purchase = player.choose_buy(
                 self, network, upto=player.purse, optional=True
             )
+            self.decision_point = None
 
             if purchase:
-                c = getcard(purchase, self.supply, upto=player.purse)
-                print("Purchased " + purchase)
-                player.discard.append(self.supply[purchase].pop())
-                player.buys = player.buys - 1
-                player.purse = player.purse - c.cost
-                player.cprint(player.name + " bought " + c.name + ". ")
-                c.ongain(player, self, network, mock=False)
-                c.onbuy(player, self, network, mock=False)
-                player.cards_bought += 1
-
+                self.buy_card(player, purchase, network)
                 if player.type != "neural_network":
-                    board_state = self.get_game_state(player)
-                    hand = board_state[0]
-                    if len(hand) == 0:
-                        print("Empty hand")
-                        hand = np.zeros((1, 33))
-
-                    hand_one_hot = board_state[1]
-                    if len(hand_one_hot) == 0:
-                        hand_one_hot = [0]
-
-                    player.current_game_hand_states.append(hand)
-                    player.current_game_hand_one_hot.append(hand_one_hot)
-                    player.current_game_kingdom_states.append(board_state[2])
-                    player.current_game_kingdom_one_hot.append(board_state[3])
-                    player.current_game_opponent_states.append(board_state[4])
-                    player.current_game_states.append(board_state[5])
+                    player.record_state(self.get_game_state(player))
             else:
                 player.buys = 0
                 if player.type != "neural_network":
-                    board_state = self.get_game_state(player)
-                    hand = board_state[0]
-                    if len(hand) == 0:
-                        print("Empty hand")
-                        hand = np.zeros((1, 33))
-
-                    hand_one_hot = board_state[1]
-                    if len(hand_one_hot) == 0:
-                        hand_one_hot = [0]
-
-                    player.current_game_hand_states.append(hand)
-                    player.current_game_hand_one_hot.append(hand_one_hot)
-                    player.current_game_kingdom_states.append(board_state[2])
-                    player.current_game_kingdom_one_hot.append(board_state[3])
-                    player.current_game_opponent_states.append(board_state[4])
-                    player.current_game_states.append(board_state[5])
+                    player.record_state(self.get_game_state(player))
 
-        player.cleanup()
-
-    def play_game(self, networks=Dict[str, DominionNetwork]) -> List[str]:
+    def play_game(self, networks: Dict[str, DominionNetwork]) -> List[str]:
         turn = 0
-        while not Game.gameover(self.supply) and turn <= 75:
+        while not Game.gameover(self.supply, self.log) and turn <= 75:
             turn += 1
-            print("turn " + str(turn))
-            name_list = []
-            cost_list = []
-            quantity_list = []
-            for value in self.supply_order:
-                for stack in self.supply_order[value]:
-                    if stack in self.supply:
-                        name_list.append(stack)
-                        cost_list.append(value)
-                        quantity_list.append(len(self.supply[stack]))
-            supplydf = pandas.DataFrame(
-                data={"Cost": cost_list, "Remaining": quantity_list}, index=name_list
-            )
-            if self.verbose:
-                print("\n\nSUPPLY")
-                print(supplydf)
-                print("\r")
-                print(
+            self.log.debug("game", "turn %d", turn)
+            if self.log.enabled(Log.DEBUG):
+                self.log.debug("game", "SUPPLY\n%s", self.supply_report())
+                self.log.debug(
+                    "game",
+                    "%s",
                     Game.cardsummaries(self.players).loc[
                         ["Total cards", "VICTORY POINTS"]
-                    ]
+                    ],
                 )
-                print("\nStart of turn " + str(turn))
+                self.log.debug("game", "Start of turn %d", turn)
             for player in self.players:
-                if not Game.gameover(self.supply):
+                if not Game.gameover(self.supply, self.log):
                     self.take_turn(player, networks[player.name])
                     last_turn = player.order
                 else:
                     break
 
         # Final scores and winners
-        dcs = Game.cardsummaries(self.players)
-        vp = dcs.loc["VICTORY POINTS"]
-        vpmax = vp.max()
+        vp = [player.calcpoints() for player in self.players]
+        vpmax = max(vp)
         high_scores2 = []
         high_scores1 = []
         winners = []
-        for player in self.players:
-            if vp.loc[player.name] == vpmax:
+        for player, points in zip(self.players, vp):
+            if points == vpmax:
                 if player.order > last_turn:
                     high_scores2.append(player.name)
                 else:
@@ -502,7 +355,7 @@ class Game:
 
         for player in self.players:
             if (player.calcpoints() == vpmax) and (turn <= 75):
-                print(player.calcpoints())
+                self.log.debug("game", "%s scored %d", player.name, vpmax)
                 if len(high_scores2) + len(high_scores1) == 1:
                     player.game_over(
                         networks[player.name], 1.0, float(max(vp) - min(vp)) / 10.0
@@ -516,6 +369,5 @@ class Game:
                     networks[player.name], -1.0, float(min(vp) - max(vp)) / 10.0
                 )
 
-        if not self.verbose:
-            print("\n\nGAME OVER!!!   " + winstring + "\n")
+        self.log.info("game", "GAME OVER!!!   %s", winstring)
         return winners
@@ -0,0 +1,34 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple
+
+if TYPE_CHECKING:
+    import Player
+
+
+# Undo log shared by a game and its players. While a checkpoint is open, every
+# zone mutation made through the Player API records a closure that reverts it,
+# so hypothetical moves can be applied in place and rolled back.
+class Journal:
+    def __init__(self):
+        self.entries: List[Callable[[], None]] = []
+        self.depth = 0
+
+    def record(self, undo: Callable[[], None]):
+        self.entries.append(undo)
+
+    def checkpoint(
+        self, players: List[Player.Player]
+    ) -> Tuple[int, List[Tuple[Player.Player, Tuple[Any, ...]]]]:
+        self.depth += 1
+        return (
+            len(self.entries),
+            [(player, player.get_counters()) for player in players],
+        )
+
+    def rollback(self, mark: Tuple[int, List[Tuple[Player.Player, Tuple[Any, ...]]]]):
+        length, counters = mark
+        while len(self.entries) > length:
+            self.entries.pop()()
+        for player, values in counters:
+            player.set_counters(values)
+        self.depth -= 1
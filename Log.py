@@ -0,0 +1,42 @@
+from __future__ import annotations
+from typing import Any
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+LevelNames = {"debug": DEBUG, "info": INFO, "warning": WARNING, "off": OFF}
+
+
+# Level-based event log shared by the game, its players, the cards and the
+# network. Every event has a short name and a format string whose arguments are
+# passed separately, so below the level nothing is formatted or written.
+class Logger:
+    def __init__(self, level: int = INFO):
+        self.level = level
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, event: str, message: str, *args: Any):
+        if level >= self.level:
+            if args:
+                message = message % args
+            print("[" + event + "] " + message)
+
+    def debug(self, event: str, message: str, *args: Any):
+        if DEBUG >= self.level:
+            self.log(DEBUG, event, message, *args)
+
+    def info(self, event: str, message: str, *args: Any):
+        if INFO >= self.level:
+            self.log(INFO, event, message, *args)
+
+    def warning(self, event: str, message: str, *args: Any):
+        if WARNING >= self.level:
+            self.log(WARNING, event, message, *args)
+
+
+# Used by anything that is not handed a logger of its own
+default = Logger()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+import math
+import os
+import random
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import Game
+import Log
+from utils import process_context
+
+if TYPE_CHECKING:
+    import Player
+    from nn.network import Network
+
+
+class Edge:
+    # One option of a decision. Before the option has been visited its value is
+    # the network's estimate of the position right after taking it.
+    __slots__ = ("prior", "value_prior", "visits", "value_sum", "state", "next")
+
+    def __init__(self, prior: float, value_prior: float, state):
+        self.prior = prior
+        self.value_prior = value_prior
+        self.visits = 0
+        self.value_sum = 0.0
+        self.state = state
+        # The player's next decision in the same turn, keyed by decision kind
+        # and options since the cards drawn differ between determinizations
+        self.next: Dict[Tuple, Node] = {}
+
+    def value(self) -> float:
+        if self.visits == 0:
+            return self.value_prior
+        return self.value_sum / self.visits
+
+
+class Node:
+    # A turn-level decision of the searching player: an action to play or a
+    # card to buy, with one edge per distinct option
+    __slots__ = ("key", "edges", "visits")
+
+    def __init__(self, key: Tuple):
+        self.key = key
+        self.edges: Dict[Optional[str], Edge] = {}
+        self.visits = 0
+
+    def expanded(self) -> bool:
+        return len(self.edges) > 0
+
+    def expand(
+        self, options: List[Optional[str]], values: List[float], states, temperature
+    ):
+        best = max(values)
+        weights = [math.exp((value - best) / temperature) for value in values]
+        total = sum(weights)
+        for option, value, weight, state in zip(options, values, weights, states):
+            edge = self.edges.get(option)
+            if edge is None:
+                self.edges[option] = Edge(weight / total, value, state)
+            else:
+                # Re-expanding keeps the visit statistics and the subtree
+                edge.prior = weight / total
+                edge.value_prior = value
+                edge.state = state
+
+    def select(self, c_puct: float) -> Optional[str]:
+        # PUCT: exploit the mean value, explore options the prior favours
+        scale = c_puct * math.sqrt(self.visits + 1)
+        best_score = -math.inf
+        best_option = None
+        for option, edge in self.edges.items():
+            score = edge.value() + scale * edge.prior / (1 + edge.visits)
+            if score > best_score:
+                best_score = score
+                best_option = option
+        return best_option
+
+    def detached(self) -> Node:
+        # The expanded root without positions or subtrees, to send to a worker
+        node = Node(self.key)
+        for option, edge in self.edges.items():
+            node.edges[option] = Edge(edge.prior, edge.value_prior, None)
+        return node
+
+    def most_visited(self) -> Optional[str]:
+        return max(
+            self.edges,
+            key=lambda option: (self.edges[option].visits, self.edges[option].value()),
+        )
+
+
+class LeafReached(Exception):
+    # Unwinds a simulated turn once it reaches a decision not yet in the tree
+    def __init__(self, value: float):
+        Exception.__init__(self)
+        self.value = value
+
+
+def determinize(game: Game.Game, player: Player.Player):
+    # Resamples what the player cannot see: the order of its own deck and which
+    # of their unseen cards the opponents hold in hand
+    for other in game.players:
+        if other is player:
+            random.shuffle(other.deck)
+            continue
+        unseen = other.hand + other.deck
+        random.shuffle(unseen)
+        other.hand = unseen[: len(other.hand)]
+        other.deck = unseen[len(other.hand) :]
+        other.zone_counts["hand"] = Counter(card.name for card in other.hand)
+        other.zone_counts["deck"] = Counter(card.name for card in other.deck)
+
+
+def simulation_game(game: Game.Game) -> Game.Game:
+    sim = game.clone()
+    sim.log = Log.Logger(Log.OFF)
+    for player in sim.players:
+        player.log = sim.log
+    return sim
+
+
+class SearchPool:
+    # Worker processes for root-parallel search. Each worker loads its own copy
+    # of the network, runs an independent search of a determinized copy of the
+    # position and returns the visit counts and value sums of the root options,
+    # which are summed into the caller's root.
+    def __init__(self, network: Network, num_workers: int = None):
+        self.num_workers = num_workers or os.cpu_count()
+        self.pool = process_context().Pool(
+            self.num_workers,
+            initializer=start_search_worker,
+            initargs=(type(network), network.model.get_weights()),
+        )
+
+    def search(
+        self,
+        game: Game.Game,
+        player_index: int,
+        root: Node,
+        simulations: Optional[int],
+        time_budget: Optional[float],
+    ):
+        # Game.clone drops the undo log and anything the player keeps for its
+        # own search. Without the states recorded for training what is left is
+        # small enough to pickle for every decision.
+        position = game.clone()
+        for player in position.players:
+            player.clear_records()
+        tasks = []
+        for worker in range(self.num_workers):
+            share = None
+            if simulations is not None:
+                share = simulations // self.num_workers
+                share += worker < simulations % self.num_workers
+                if share == 0:
+                    continue
+            tasks.append(
+                (
+                    position,
+                    player_index,
+                    root.detached(),
+                    share,
+                    time_budget,
+                    random.getrandbits(32),
+                )
+            )
+
+        for results in self.pool.map(run_search_worker, tasks):
+            for option, visits, value_sum in results:
+                edge = root.edges[option]
+                edge.visits += visits
+                edge.value_sum += value_sum
+                root.visits += visits
+
+    def stop(self):
+        self.pool.close()
+        self.pool.join()
+
+
+# The network of a SearchPool worker process
+worker_network: Network = None
+
+
+def start_search_worker(network_class, weights):
+    global worker_network
+    worker_network = network_class()
+    worker_network.set_weights(weights)
+
+
+def run_search_worker(task) -> List[Tuple[Optional[str], int, float]]:
+    game, player_index, root, simulations, time_budget, seed = task
+    random.seed(seed)
+    player = game.players[player_index]
+    player.search(game, worker_network, root, simulations, time_budget)
+    return [
+        (option, edge.visits, edge.value_sum) for option, edge in root.edges.items()
+    ]
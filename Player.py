@@ -1,21 +1,47 @@
 from __future__ import annotations
 
 import random
+import time
 import numpy as np
-from copy import deepcopy
-from typing import List, Tuple, Dict, Callable
+from collections import Counter
+from typing import TYPE_CHECKING, List, Optional, Tuple, Dict, Callable
 
 import Game
+import Journal
+import Log
+import MCTS
+import Rollout
 from Card import Card, CardNameMap, Copper, Estate
-from nn.network_definition import DominionNetwork
 from utils import namesinlist, getcard
 
+if TYPE_CHECKING:
+    from nn.network_definition import DominionNetwork
+
 
 class Player:
+    zones = ("deck", "hand", "played", "discard", "aside", "hold")
+    counter_fields = (
+        "turns",
+        "actions",
+        "buys",
+        "purse",
+        "our_turn",
+        "actions_played",
+        "treasures_played",
+        "cards_gained",
+        "cards_bought",
+    )
+    # Whether Game.treasure_phase plays the plain treasures in bulk. Off for
+    # interactive players, who are asked about every treasure.
+    autoplay_treasures = False
+
     def __init__(self, name: str, order: int):
         self.name = name
         self.order = order
+        self.journal = Journal.Journal()
+        self.log = Log.default
         self.hand: List[Card] = []
+        # The deck is stored bottom to top so drawing pops from the end
         self.deck: List[Card] = []
         self.deck += [Copper()] * 7
         self.deck += [Estate()] * 3
@@ -24,7 +50,21 @@ class Player:
         self.discard: List[Card] = []
         self.aside: List[Card] = []
         self.hold: List[Card] = []
+        # Card name counts per zone and over everything the player owns, kept
+        # in step with the zone lists by the mutation methods below
+        self.zone_counts: Dict[str, Counter] = {
+            zone: Counter(card.name for card in getattr(self, zone))
+            for zone in Player.zones
+        }
+        self.owned: Counter = Counter(card.name for card in self.deck)
+        self.num_cards = len(self.deck)
+        # Victory points only change when cards enter or leave the player's
+        # possession, so they are cached until then
+        self.cached_points: int = None
         self.turns = 0
+        self.actions = 0
+        self.buys = 0
+        self.purse = 0
         self.type = "normal"
         self.our_turn = 0
         self.actions_played = 0
@@ -38,10 +78,28 @@ class Player:
         self.current_game_opponent_states: List[List[List[float]]] = []
         self.current_game_states: List[List[float]] = []
         self.discount_factor = 0.99
-        self.batch_size = 1
         for i in range(5):
             self.draw()
 
+    def clone(self) -> Player:
+        # Copies the zones, counts and counters but shares the Card instances,
+        # which are never mutated. Game.clone gives the copy its journal.
+        other = object.__new__(type(self))
+        other.__dict__.update(self.__dict__)
+        for zone in Player.zones:
+            setattr(other, zone, list(getattr(self, zone)))
+        other.zone_counts = {
+            zone: Counter(counts) for zone, counts in self.zone_counts.items()
+        }
+        other.owned = Counter(self.owned)
+        other.current_game_hand_states = list(self.current_game_hand_states)
+        other.current_game_hand_one_hot = list(self.current_game_hand_one_hot)
+        other.current_game_kingdom_states = list(self.current_game_kingdom_states)
+        other.current_game_kingdom_one_hot = list(self.current_game_kingdom_one_hot)
+        other.current_game_opponent_states = list(self.current_game_opponent_states)
+        other.current_game_states = list(self.current_game_states)
+        return other
+
     def other(self) -> List[Card]:
         return self.played + self.discard + self.hold + self.aside
 
@@ -50,22 +108,161 @@ class Player:
             self.deck + self.hand + self.played + self.discard + self.aside + self.hold
         )
 
-    def draw(self, dest: List[Card] = None) -> Card:
+    def change_owned(self, card_name: str, count: int):
+        self.owned[card_name] += count
+        self.num_cards += count
+        self.cached_points = None
+
+    def get_counters(self) -> Tuple[int, ...]:
+        return tuple(getattr(self, field) for field in Player.counter_fields)
+
+    def set_counters(self, values: Tuple[int, ...]):
+        for field, value in zip(Player.counter_fields, values):
+            setattr(self, field, value)
+
+    def draw(self, dest: str = "hand") -> Card:
         # defualt destination is player's hand
-        if dest is None:
-            dest = self.hand
         # Replenish deck if necessary.
         if len(self.deck) == 0:
-            self.deck = self.discard
-            self.discard = []
-            random.shuffle(self.deck)
-        # If deck has cards, add card to destination list
+            self.reshuffle()
+        # If deck has cards, add card to destination zone
         if len(self.deck) > 0:
-            c = self.deck.pop(0)
-            dest.append(c)
+            deck = self.deck
+            target = getattr(self, dest)
+            deck_counts = self.zone_counts["deck"]
+            target_counts = self.zone_counts[dest]
+            c = deck.pop()
+            target.append(c)
+            deck_counts[c.name] -= 1
+            target_counts[c.name] += 1
+            if self.journal.depth:
+
+                def undo():
+                    deck.append(target.pop())
+                    deck_counts[c.name] += 1
+                    target_counts[c.name] -= 1
+
+                self.journal.record(undo)
             return c
         return None
 
+    def reshuffle(self):
+        old_deck = self.deck
+        old_discard = self.discard
+        old_deck_counts = self.zone_counts["deck"]
+        old_discard_counts = self.zone_counts["discard"]
+        if self.journal.depth:
+            order = old_discard[:]
+
+            def undo():
+                old_discard[:] = order
+                self.deck = old_deck
+                self.discard = old_discard
+                self.zone_counts["deck"] = old_deck_counts
+                self.zone_counts["discard"] = old_discard_counts
+
+            self.journal.record(undo)
+        self.deck = old_discard
+        self.discard = []
+        self.zone_counts["deck"] = old_discard_counts
+        self.zone_counts["discard"] = Counter()
+        random.shuffle(self.deck)
+
+    def put_on_top(self, card: Card, src: str = "hand"):
+        self.move_card(card, src, "deck")
+
+    def move_card(self, card: Card, src: str, dst: str, to: Player = None):
+        # Moves one card between zones, by default within this player's zones
+        owner = to if to is not None else self
+        source = getattr(self, src)
+        target = getattr(owner, dst)
+        source_counts = self.zone_counts[src]
+        target_counts = owner.zone_counts[dst]
+        idx = source.index(card)
+        del source[idx]
+        target.append(card)
+        source_counts[card.name] -= 1
+        target_counts[card.name] += 1
+        if owner is not self:
+            self.change_owned(card.name, -1)
+            owner.change_owned(card.name, 1)
+        if self.journal.depth:
+
+            def undo():
+                target.pop()
+                source.insert(idx, card)
+                source_counts[card.name] += 1
+                target_counts[card.name] -= 1
+                if owner is not self:
+                    self.change_owned(card.name, 1)
+                    owner.change_owned(card.name, -1)
+
+            self.journal.record(undo)
+
+    def move_all(self, src: str, dst: str):
+        source = getattr(self, src)
+        target = getattr(self, dst)
+        source_counts = self.zone_counts[src]
+        target_counts = self.zone_counts[dst]
+        cards = source[:]
+        counts = +source_counts
+        target.extend(cards)
+        source.clear()
+        target_counts.update(counts)
+        source_counts.clear()
+        if self.journal.depth:
+
+            def undo():
+                del target[len(target) - len(cards) :]
+                source[:] = cards
+                target_counts.subtract(counts)
+                source_counts.update(counts)
+
+            self.journal.record(undo)
+
+    def take_from_supply(
+        self, game: Game.Game, card_name: str, dst: str = "discard"
+    ) -> Card:
+        supply = game.supply
+        target = getattr(self, dst)
+        target_counts = self.zone_counts[dst]
+        c = CardNameMap[card_name]
+        supply[card_name] -= 1
+        target.append(c)
+        target_counts[card_name] += 1
+        self.change_owned(card_name, 1)
+        if self.journal.depth:
+
+            def undo():
+                target.pop()
+                supply[card_name] += 1
+                target_counts[card_name] -= 1
+                self.change_owned(card_name, -1)
+
+            self.journal.record(undo)
+        return c
+
+    def trash_card(self, game: Game.Game, card: Card, src: str = "hand"):
+        source = getattr(self, src)
+        source_counts = self.zone_counts[src]
+        trash = game.trash
+        idx = source.index(card)
+        del source[idx]
+        trash.append(card)
+        source_counts[card.name] -= 1
+        self.change_owned(card.name, -1)
+        game.trash_counts[card.name] += 1
+        if self.journal.depth:
+
+            def undo():
+                trash.pop()
+                source.insert(idx, card)
+                source_counts[card.name] += 1
+                self.change_owned(card.name, 1)
+                game.trash_counts[card.name] -= 1
+
+            self.journal.record(undo)
+
     def start_turn(self):
         self.turns += 1
         self.actions = 1
@@ -74,10 +271,9 @@ class Player:
         self.our_turn = 1
 
     def cleanup(self):
-        self.discard = self.discard + self.played + self.hand + self.aside
-        self.played = []
-        self.hand = []
-        self.aside = []
+        self.move_all("played", "discard")
+        self.move_all("hand", "discard")
+        self.move_all("aside", "discard")
         self.our_turn = 0
         self.actions_played = 0
         self.treasures_played = 0
@@ -95,7 +291,7 @@ class Player:
         mock: bool = False,
     ) -> int:
         self.actions -= 1
-        c.use(self, game.trash)
+        c.use(self, game)
         c.augment(self, draw)
         cards_from_deck = c.play(self, game, network, mock)
         return cards_from_deck + c.coins
@@ -181,10 +377,10 @@ class Player:
     ) -> str:
         return str(input(prompt))
 
-    def hprint(self, string: str):
-        print(string)
+    def hprint(self, message: str, *args):
+        print(message % args if args else message)
 
-    def cprint(self, string: str):
+    def cprint(self, message: str, *args):
         pass
 
     def show(self, lead: str = ""):
@@ -201,23 +397,76 @@ class Player:
         if len(self.aside) > 0:
             print("aside:", ", ".join(sorted(namesinlist(self.aside))))
 
+    def play_plain_treasures(
+        self, game: Game.Game, network: DominionNetwork
+    ) -> List[Card]:
+        # Treasures without choices are always worth playing, so they skip the
+        # per-card decision. Bank counts the treasures played before it and
+        # waits for any that are left to the player.
+        plain = [card for card in self.hand if card.autoplay_order is not None]
+        if any(card.is_coin and card.autoplay_order is None for card in self.hand):
+            plain = [card for card in plain if card.autoplay_order == 0]
+        plain.sort(key=lambda card: card.autoplay_order)
+
+        for card in plain:
+            card.onuse(self, game, network, mock=False)
+            self.move_card(card, "hand", "played")
+            self.treasures_played += 1
+        return plain
+
+    def clear_records(self):
+        self.current_game_hand_states = []
+        self.current_game_hand_one_hot = []
+        self.current_game_kingdom_states = []
+        self.current_game_kingdom_one_hot = []
+        self.current_game_opponent_states = []
+        self.current_game_states = []
+
+    def record_state(
+        self,
+        board_state: Tuple[
+            List[List[float]],
+            List[int],
+            List[List[float]],
+            List[int],
+            List[List[float]],
+            List[float],
+        ],
+    ):
+        hand = board_state[0]
+        if len(hand) == 0:
+            self.log.debug("state", "Empty hand")
+            hand = np.zeros((1, 33))
+
+        hand_one_hot = board_state[1]
+        if len(hand_one_hot) == 0:
+            hand_one_hot = [0]
+
+        self.current_game_hand_states.append(hand)
+        self.current_game_hand_one_hot.append(hand_one_hot)
+        self.current_game_kingdom_states.append(board_state[2])
+        self.current_game_kingdom_one_hot.append(board_state[3])
+        self.current_game_opponent_states.append(board_state[4])
+        self.current_game_states.append(board_state[5])
+
     def cardsummary(self) -> Dict[str, float]:
         summary: Dict[str, float] = {}
-        for c in self.stack():
-            if c.name in summary:
-                summary[c.name] += 1
-            else:
-                summary[c.name] = 1
-        summary["Total cards"] = len(self.stack())
+        for card_name, count in self.owned.items():
+            if count > 0:
+                summary[card_name] = count
+        summary["Total cards"] = self.num_cards
         summary["VICTORY POINTS"] = self.calcpoints()
         return summary
 
     def calcpoints(self) -> int:
-        vp = 0
-        for c in self.stack():
-            if "victory" in c.categories or "curse" in c.categories:
-                vp += c.get_points(self)
-        return vp
+        if self.cached_points is None:
+            vp = 0
+            for card_name, count in self.owned.items():
+                c = CardNameMap[card_name]
+                if count > 0 and (c.is_victory or c.is_curse):
+                    vp += count * c.get_points(self)
+            self.cached_points = vp
+        return self.cached_points
 
     def gain_card(
         self,
@@ -244,10 +493,10 @@ class Player:
         if card:
             c = getcard(card, game.supply, upto=upto)
             if destination == "hand":
-                self.hand.append(game.supply[card].pop())
+                self.take_from_supply(game, card, "hand")
             else:
-                self.discard.append(game.supply[card].pop())
-            self.cprint(self.name + " gained " + c.name + ". ")
+                self.take_from_supply(game, card)
+            self.cprint("%s gained %s. ", self.name, c.name)
             c.ongain(self, game, network, mock=False)
             self.cards_gained += 1
             return card
@@ -256,9 +505,14 @@ class Player:
     def game_over(
         self, network: DominionNetwork, reward: float, point_difference: float
     ):
-        print("Reward is " + str(reward))
-        print("Point difference is " + str(point_difference))
-        print(len(self.current_game_hand_states))
+        self.log.info(
+            "game",
+            "%s: reward is %s, point difference is %s, %d states",
+            self.name,
+            reward,
+            point_difference,
+            len(self.current_game_hand_states),
+        )
 
         train_batch_hand = []
         train_batch_hand_one_hot = []
@@ -289,43 +543,30 @@ class Player:
             reward *= self.discount_factor
             point_difference *= self.discount_factor
 
-            if len(train_batch_reward) >= self.batch_size:
-                network.update(
-                    train_batch_hand,
-                    train_batch_hand_one_hot,
-                    train_batch_kingdom,
-                    train_batch_kingdom_one_hot,
-                    train_batch_opponent,
-                    train_batch_state,
-                    train_batch_reward,
-                    train_batch_point_difference,
-                )
-                train_batch_hand = []
-                train_batch_hand_one_hot = []
-                train_batch_kingdom = []
-                train_batch_kingdom_one_hot = []
-                train_batch_opponent = []
-                train_batch_state = []
-                train_batch_reward = []
-                train_batch_point_difference = []
+        network.add_experience(
+            train_batch_hand,
+            train_batch_hand_one_hot,
+            train_batch_kingdom,
+            train_batch_kingdom_one_hot,
+            train_batch_opponent,
+            train_batch_state,
+            train_batch_reward,
+            train_batch_point_difference,
+        )
 
-        self.current_game_hand_states = []
-        self.current_game_hand_one_hot = []
-        self.current_game_kingdom_states = []
-        self.current_game_kingdom_one_hot = []
-        self.current_game_opponent_states = []
-        self.current_game_states = []
-        network.get_summary()
-        network.save()
+        self.clear_records()
 
 
 class NNPlayer(Player):
+    autoplay_treasures = True
+
     def __init__(
         self,
         name: str,
         order: int,
         initial_exploration_temperature: float = 0.001,
         game_index: int = 1,
+        max_mock_depth: int = 1,
     ):
         Player.__init__(self, name, order)
 
@@ -333,6 +574,17 @@ class NNPlayer(Player):
         self.type = "neural_network"
         self.game_index = game_index
 
+        # Decisions made inside a lookahead are evaluated up to max_mock_depth
+        # levels deep and answered by a cheap policy below that. Their results
+        # are remembered for the rest of the top-level decision.
+        self.max_mock_depth = max_mock_depth
+        self.decision_cache: Dict[Tuple, str] = {}
+
+    def clone(self) -> NNPlayer:
+        other = Player.clone(self)
+        other.decision_cache = {}
+        return other
+
     def get_exploration_factor(self) -> float:
         return self.initial_exploration_temperature * np.power(
             1 - 0.0002, self.game_index
@@ -349,26 +601,22 @@ class NNPlayer(Player):
         List[float],
     ]:
 
-        game_copy = deepcopy(game)
-        self_copy = deepcopy(self)
-
-        if action:
-            c = getcard(
-                action.name, game_copy.supply, self_copy.hand, "your hand", ["action"]
-            )
-            self_copy.cprint(self_copy.name + " thought about playing " + c.name + ". ")
+        with game.lookahead():
+            if action:
+                c = getcard(
+                    action.name, game.supply, self.hand, "your hand", ["action"]
+                )
+                self.cprint("%s thought about playing %s. ", self.name, c.name)
 
-            cards_from_deck = self_copy.playcard(
-                c, game_copy, network, draw=False, mock=True,
-            )
-        else:
-            self_copy.cprint(self_copy.name + " thought about playing nothing. ")
-            self_copy.actions = 0
-            cards_from_deck = 0
+                cards_from_deck = self.playcard(
+                    c, game, network, draw=False, mock=True,
+                )
+            else:
+                self.cprint("%s thought about playing nothing. ", self.name)
+                self.actions = 0
+                cards_from_deck = 0
 
-        game_state = game_copy.get_game_state(self_copy, cards_from_deck)
-        self_copy = None
-        game_copy = None
+            game_state = game.get_game_state(self, cards_from_deck)
 
         return game_state
 
@@ -388,34 +636,28 @@ class NNPlayer(Player):
         List[float],
     ]:
 
-        game_copy = deepcopy(game)
-        self_copy = deepcopy(self)
-
-        if buy:
-            c = getcard(buy.name, game_copy.supply)
-            if c:
-                if destination == "hand":
-                    self_copy.hand.append(game_copy.supply[buy.name].pop())
-                else:
-                    self_copy.discard.append(game_copy.supply[buy.name].pop())
+        with game.lookahead():
+            if buy:
+                c = getcard(buy.name, game.supply)
+                if c:
+                    if destination == "hand":
+                        self.take_from_supply(game, buy.name, "hand")
+                    else:
+                        self.take_from_supply(game, buy.name)
+                    if not gain:
+                        self.buys = self.buys - 1
+                        self.purse = self.purse - c.cost
+                        if self.purse < 0:
+                            raise ValueError
+                        c.onbuy(self, game, network, mock=True)
+                    c.ongain(self, game, network, mock=True)
+                    self.cprint("%s thought about buying %s. ", self.name, c.name)
+            else:
+                self.cprint("%s thought about buying nothing. ", self.name)
                 if not gain:
-                    self_copy.buys = self_copy.buys - 1
-                    self_copy.purse = self_copy.purse - c.cost
-                    if self_copy.purse < 0:
-                        raise ValueError
-                    c.onbuy(self_copy, game_copy, network, mock=True)
-                c.ongain(self_copy, game_copy, network, mock=True)
-                self_copy.cprint(
-                    self_copy.name + " thought about buying " + c.name + ". "
-                )
-        else:
-            self_copy.cprint(self_copy.name + " thought about buying nothing. ")
-            if not gain:
-                self_copy.buys = 0
+                    self.buys = 0
 
-        game_state = game_copy.get_game_state(self_copy)
-        game_copy = None
-        self_copy = None
+            game_state = game.get_game_state(self)
 
         return game_state
 
@@ -430,26 +672,21 @@ class NNPlayer(Player):
         List[float],
     ]:
 
-        game_copy = deepcopy(game)
-        self_copy = deepcopy(self)
-
-        if treasure is not None:
-            c = getcard(
-                treasure.name, game_copy.supply, self_copy.hand, "your hand", ["coin"]
-            )
-            c.onuse(self_copy, game_copy, network, mock=True)
-            self_copy.hand.remove(c)
-            self_copy.played.append(c)
-            self_copy.treasures_played += 1
+        with game.lookahead():
+            if treasure is not None:
+                c = getcard(
+                    treasure.name, game.supply, self.hand, "your hand", ["coin"]
+                )
+                c.onuse(self, game, network, mock=True)
+                self.move_card(c, "hand", "played")
+                self.treasures_played += 1
 
-            self_copy.cprint(self_copy.name + " thought about playing " + c.name + ". ")
-        else:
-            self_copy.cprint(self_copy.name + " thought about playing nothing. ")
+                self.cprint("%s thought about playing %s. ", self.name, c.name)
+            else:
+                self.cprint("%s thought about playing nothing. ", self.name)
 
-        game_state = game_copy.get_game_state(self_copy)
+            game_state = game.get_game_state(self)
 
-        game_copy = None
-        self_copy = None
         return game_state
 
     def discard_and_get_game_state(
@@ -469,28 +706,68 @@ class NNPlayer(Player):
         List[float],
     ]:
 
-        game_copy = deepcopy(game)
-        self_copy = deepcopy(self)
+        with game.lookahead():
+            if discard:
+                c = getcard(discard.name, game.supply, self.hand, "your hand")
 
-        if discard:
-            c = getcard(discard.name, game_copy.supply, self_copy.hand, "your hand")
-            self_copy.hand.remove(c)
-
-            if ondeck:
-                self_copy.deck.insert(0, c)
-            elif trash_card:
-                game_copy.trash.append(c)
-                c.ontrash(self_copy, game_copy, network, mock=True)
-            else:
-                self_copy.discard.append(c)
-                c.ondiscard(self_copy, game_copy, network, mock=True)
+                if ondeck:
+                    self.put_on_top(c)
+                elif trash_card:
+                    self.trash_card(game, c)
+                    c.ontrash(self, game, network, mock=True)
+                else:
+                    self.move_card(c, "hand", "discard")
+                    c.ondiscard(self, game, network, mock=True)
 
-        game_state = game_copy.get_game_state(self_copy, additional_draw)
+            game_state = game.get_game_state(self, additional_draw)
 
-        game_copy = None
-        self_copy = None
         return game_state
 
+    def decision_key(self, game: Game.Game, kind: Tuple, options: Tuple) -> Tuple:
+        if game.journal.depth == 0:
+            self.decision_cache.clear()
+            return None
+        game_state = game.get_game_state(self)
+        return (tuple(array.tobytes() for array in game_state), kind, options)
+
+    def remember(self, key: Tuple, choice):
+        if key is not None:
+            self.decision_cache[key] = choice
+        return choice
+
+    def beyond_mock_depth(self, game: Game.Game) -> bool:
+        return game.journal.depth > self.max_mock_depth
+
+    @staticmethod
+    def fallback_choice(candidates: List[Card], most_expensive: bool) -> str:
+        cards = [card for card in candidates if card]
+        if len(cards) == 0:
+            return None
+        if most_expensive:
+            return max(cards, key=lambda card: card.cost).name
+        return min(cards, key=lambda card: card.cost).name
+
+    @staticmethod
+    def distinct_cards(cards: List[Card]) -> Tuple[List[Card], Dict[str, int]]:
+        # Identical cards lead to identical positions, so each name is simulated
+        # once. The counts let sampling weigh a name by its copies in hand.
+        distinct: List[Card] = []
+        counts: Dict[str, int] = {}
+        for card in cards:
+            if card.name not in counts:
+                distinct.append(card)
+                counts[card.name] = 0
+            counts[card.name] += 1
+        return distinct, counts
+
+    @staticmethod
+    def describe(candidates: List[Card]) -> List[str]:
+        return [card.name if card else "nothing" for card in candidates]
+
+    @staticmethod
+    def candidate_names(candidates: List[Card]) -> Tuple:
+        return tuple(card.name if card else None for card in candidates)
+
     @staticmethod
     def random_index(scores: List[float], temperature: float) -> int:
         max_score = max(scores)
@@ -520,24 +797,14 @@ class NNPlayer(Player):
         List[List[float]],
         List[float],
     ]:
-        game_copy = deepcopy(game)
-        self_copy = deepcopy(self)
-
-        if applyto:
-            applyto_copy = deepcopy(applyto)
-
-        if applyto:
-            callback(applyto_copy, game_copy, network, True)
-        else:
-            callback(self_copy, game_copy, network, True)
-
-        # TODO: Should add in draw cards context here
-        game_state = game_copy.get_game_state(self_copy)
+        with game.lookahead():
+            if applyto:
+                callback(applyto, game, network, True)
+            else:
+                callback(self, game, network, True)
 
-        game_copy = None
-        self_copy = None
-        if applyto:
-            applyto_copy = None
+            # TODO: Should add in draw cards context here
+            game_state = game.get_game_state(self)
 
         return game_state
 
@@ -554,15 +821,31 @@ class NNPlayer(Player):
         if optional:
             potential_actions.append(None)
 
-        for card in self.hand:
-            if "action" in card.categories:
-                potential_actions.append(card)
+        actions, counts = NNPlayer.distinct_cards(
+            [card for card in self.hand if card.is_action]
+        )
+        potential_actions.extend(actions)
 
-        print(potential_actions)
+        if self.log.enabled(Log.DEBUG):
+            self.log.debug(
+                "decision",
+                "Actions: %s",
+                ", ".join(NNPlayer.describe(potential_actions)),
+            )
 
         if len(potential_actions) == 0:
             return None
 
+        key = self.decision_key(
+            game, ("action",), NNPlayer.candidate_names(potential_actions)
+        )
+        if key in self.decision_cache:
+            return self.decision_cache[key]
+        if self.beyond_mock_depth(game):
+            return self.remember(
+                key, NNPlayer.fallback_choice(potential_actions, True)
+            )
+
         scores: List[float] = []
         states: List[
             Tuple[
@@ -576,38 +859,25 @@ class NNPlayer(Player):
         ] = []
 
         for action in potential_actions:
-            board_state = self.play_action_and_get_game_state(game, action, network)
-            score = network.eval_position(board_state)
-            print(score)
+            states.append(self.play_action_and_get_game_state(game, action, network))
+
+        temperature = self.get_exploration_factor()
+        for action, score in zip(potential_actions, network.eval_positions(states)):
+            self.log.debug("decision", "score %s", score)
             if action:
-                scores.append(score)
+                scores.append(score + temperature * np.log(counts[action.name]))
             else:
                 scores.append(score-0.1)
-            states.append(board_state)
 
-        chosen_index = NNPlayer.random_index(scores, self.get_exploration_factor())
+        chosen_index = NNPlayer.random_index(scores, temperature)
         best_state = states[chosen_index]
         best_action = potential_actions[chosen_index]
 
         if not mock:
-            hand = best_state[0]
-            if len(hand) == 0:
-                print("Empty hand")
-                hand = np.zeros((1, 33))
-
-            hand_one_hot = best_state[1]
-            if len(hand_one_hot) == 0:
-                hand_one_hot = [0]
-
-            self.current_game_hand_states.append(hand)
-            self.current_game_hand_one_hot.append(hand_one_hot)
-            self.current_game_kingdom_states.append(best_state[2])
-            self.current_game_kingdom_one_hot.append(best_state[3])
-            self.current_game_opponent_states.append(best_state[4])
-            self.current_game_states.append(best_state[5])
+            self.record_state(best_state)
         if best_action:
-            return best_action.name
-        return None
+            return self.remember(key, best_action.name)
+        return self.remember(key, None)
 
     def choose_buy(
         self,
@@ -627,10 +897,10 @@ class NNPlayer(Player):
         for card in game.supply:
             if (
                 (CardNameMap[card].cost <= upto)
-                and len(game.supply[card])
+                and game.supply[card]
                 and (not exact or (CardNameMap[card].cost == upto))
                 and (
-                    (constraint is None) or (constraint in CardNameMap[card].categories)
+                    (constraint is None) or CardNameMap[card].has_category(constraint)
                 )
                 > 0
             ):
@@ -639,11 +909,24 @@ class NNPlayer(Player):
         if optional:
             potential_buys.append(None)
 
-        print(potential_buys)
+        if self.log.enabled(Log.DEBUG):
+            self.log.debug(
+                "decision", "Buys: %s", ", ".join(NNPlayer.describe(potential_buys))
+            )
 
         if len(potential_buys) == 0:
             return None
 
+        key = self.decision_key(
+            game,
+            ("buy", gain, constraint, destination),
+            NNPlayer.candidate_names(potential_buys),
+        )
+        if key in self.decision_cache:
+            return self.decision_cache[key]
+        if self.beyond_mock_depth(game):
+            return self.remember(key, NNPlayer.fallback_choice(potential_buys, True))
+
         scores: List[float] = []
         states: List[
             Tuple[
@@ -657,40 +940,25 @@ class NNPlayer(Player):
         ] = []
 
         for buy in potential_buys:
-            board_state = self.buy_card_and_get_game_state(
-                game, buy, network, gain=gain, destination=destination
+            states.append(
+                self.buy_card_and_get_game_state(
+                    game, buy, network, gain=gain, destination=destination
+                )
             )
-            score = network.eval_position(board_state)
-            print(score)
-            if buy:
-                scores.append(score)
-            else:
-                scores.append(score)
-            states.append(board_state)
+
+        for score in network.eval_positions(states):
+            self.log.debug("decision", "score %s", score)
+            scores.append(score)
 
         chosen_index = NNPlayer.random_index(scores, self.get_exploration_factor())
         best_state = states[chosen_index]
         best_buy = potential_buys[chosen_index]
 
         if not mock:
-            hand = best_state[0]
-            if len(hand) == 0:
-                print("Empty hand")
-                hand = np.zeros((1, 33))
-
-            hand_one_hot = best_state[1]
-            if len(hand_one_hot) == 0:
-                hand_one_hot = [0]
-
-            self.current_game_hand_states.append(hand)
-            self.current_game_hand_one_hot.append(hand_one_hot)
-            self.current_game_kingdom_states.append(best_state[2])
-            self.current_game_kingdom_one_hot.append(best_state[3])
-            self.current_game_opponent_states.append(best_state[4])
-            self.current_game_states.append(best_state[5])
+            self.record_state(best_state)
         if best_buy:
-            return best_buy.name
-        return None
+            return self.remember(key, best_buy.name)
+        return self.remember(key, None)
 
     def choose_treasure(
         self, game: Game.Game, network: DominionNetwork, mock: bool = False,
@@ -698,9 +966,20 @@ class NNPlayer(Player):
 
         potential_treasures: List[Card] = [None]
 
-        for card in self.hand:
-            if "coin" in card.categories:
-                potential_treasures.append(card)
+        treasures, counts = NNPlayer.distinct_cards(
+            [card for card in self.hand if card.is_coin]
+        )
+        potential_treasures.extend(treasures)
+
+        key = self.decision_key(
+            game, ("treasure",), NNPlayer.candidate_names(potential_treasures)
+        )
+        if key in self.decision_cache:
+            return self.decision_cache[key]
+        if self.beyond_mock_depth(game):
+            return self.remember(
+                key, NNPlayer.fallback_choice(potential_treasures, True)
+            )
 
         scores: List[float] = []
         states: List[
@@ -715,38 +994,29 @@ class NNPlayer(Player):
         ] = []
 
         for treasure in potential_treasures:
-            board_state = self.play_treasure_and_get_game_state(game, treasure, network)
-            score = network.eval_position(board_state)
-            print(score)
+            states.append(
+                self.play_treasure_and_get_game_state(game, treasure, network)
+            )
+
+        temperature = self.get_exploration_factor()
+        for treasure, score in zip(
+            potential_treasures, network.eval_positions(states)
+        ):
+            self.log.debug("decision", "score %s", score)
             if treasure:
-                scores.append(score)
+                scores.append(score + temperature * np.log(counts[treasure.name]))
             else:
                 scores.append(score-0.1)
-            states.append(board_state)
 
-        chosen_index = NNPlayer.random_index(scores, self.get_exploration_factor())
+        chosen_index = NNPlayer.random_index(scores, temperature)
         best_state = states[chosen_index]
         best_play = potential_treasures[chosen_index]
 
         if not mock:
-            hand = best_state[0]
-            if len(hand) == 0:
-                print("Empty hand")
-                hand = np.zeros((1, 33))
-
-            hand_one_hot = best_state[1]
-            if len(hand_one_hot) == 0:
-                hand_one_hot = [0]
-
-            self.current_game_hand_states.append(hand)
-            self.current_game_hand_one_hot.append(hand_one_hot)
-            self.current_game_kingdom_states.append(best_state[2])
-            self.current_game_kingdom_one_hot.append(best_state[3])
-            self.current_game_opponent_states.append(best_state[4])
-            self.current_game_states.append(best_state[5])
+            self.record_state(best_state)
         if best_play:
-            return best_play.name
-        return None
+            return self.remember(key, best_play.name)
+        return self.remember(key, None)
 
     def choose_discard(
         self,
@@ -766,9 +1036,14 @@ class NNPlayer(Player):
         if optional:
             candidates.append(None)
 
-        for card in self.hand:
-            if (constraint in card.categories) or (constraint is None):
-                candidates.append(card)
+        discards, counts = NNPlayer.distinct_cards(
+            [
+                card
+                for card in self.hand
+                if (constraint is None) or card.has_category(constraint)
+            ]
+        )
+        candidates.extend(discards)
 
         if len(candidates) == 1:
             if candidates[0]:
@@ -776,6 +1051,16 @@ class NNPlayer(Player):
             else:
                 return None
 
+        key = self.decision_key(
+            game,
+            ("discard", additional_draw, trash_card, ondeck),
+            NNPlayer.candidate_names(candidates),
+        )
+        if key in self.decision_cache:
+            return self.decision_cache[key]
+        if self.beyond_mock_depth(game):
+            return self.remember(key, NNPlayer.fallback_choice(candidates, False))
+
         scores: List[float] = []
         states: List[
             Tuple[
@@ -790,46 +1075,37 @@ class NNPlayer(Player):
 
         for candidate in candidates:
             if candidate:
-                print("Thought about discarding " + candidate.name)
+                self.cprint("Thought about discarding %s", candidate.name)
             else:
-                print("Thought about discarding nothing")
-            board_state = self.discard_and_get_game_state(
-                game,
-                candidate,
-                network,
-                additional_draw=additional_draw,
-                ondeck=ondeck,
-                trash_card=trash_card,
+                self.cprint("Thought about discarding nothing")
+            states.append(
+                self.discard_and_get_game_state(
+                    game,
+                    candidate,
+                    network,
+                    additional_draw=additional_draw,
+                    ondeck=ondeck,
+                    trash_card=trash_card,
+                )
             )
-            score = network.eval_position(board_state)
-            print(score)
 
-            scores.append(score)
-            states.append(board_state)
+        temperature = self.get_exploration_factor()
+        for candidate, score in zip(candidates, network.eval_positions(states)):
+            self.log.debug("decision", "score %s", score)
+            if candidate:
+                scores.append(score + temperature * np.log(counts[candidate.name]))
+            else:
+                scores.append(score)
 
-        chosen_index = NNPlayer.random_index(scores, self.get_exploration_factor())
+        chosen_index = NNPlayer.random_index(scores, temperature)
         best_state = states[chosen_index]
         best_discard = candidates[chosen_index]
 
         if not mock:
-            hand = best_state[0]
-            if len(hand) == 0:
-                print("Empty hand")
-                hand = np.zeros((1, 33))
-
-            hand_one_hot = best_state[1]
-            if len(hand_one_hot) == 0:
-                hand_one_hot = [0]
-
-            self.current_game_hand_states.append(hand)
-            self.current_game_hand_one_hot.append(hand_one_hot)
-            self.current_game_kingdom_states.append(best_state[2])
-            self.current_game_kingdom_one_hot.append(best_state[3])
-            self.current_game_opponent_states.append(best_state[4])
-            self.current_game_states.append(best_state[5])
+            self.record_state(best_state)
         if best_discard:
-            return best_discard.name
-        return None
+            return self.remember(key, best_discard.name)
+        return self.remember(key, None)
 
     def yesnoinput(
         self,
@@ -845,6 +1121,15 @@ class NNPlayer(Player):
         mock: bool = False,
     ) -> bool:
         if callbacks:
+            key = self.decision_key(
+                game,
+                ("yesno", prompt, applyto.name if applyto else None),
+                tuple(callbacks),
+            )
+            if key in self.decision_cache:
+                return self.decision_cache[key]
+            if self.beyond_mock_depth(game):
+                return self.remember(key, True in callbacks)
 
             scores: List[float] = []
             states: List[
@@ -860,49 +1145,347 @@ class NNPlayer(Player):
             candidates: List[bool] = []
             for response in callbacks:
 
-                board_state = self.trycallback(
-                    callbacks[response], game, network, applyto=applyto,
+                states.append(
+                    self.trycallback(
+                        callbacks[response], game, network, applyto=applyto,
+                    )
                 )
-                score = network.eval_position(board_state)
-                print("Option " + str(response) + " score: " + str(score))
-                scores.append(score)
-                states.append(board_state)
                 candidates.append(response)
 
+            for response, score in zip(candidates, network.eval_positions(states)):
+                self.log.debug("decision", "Option %s score: %s", response, score)
+                scores.append(score)
+
             chosen_index = NNPlayer.random_index(scores, self.get_exploration_factor())
             best_state = states[chosen_index]
             best_response = candidates[chosen_index]
 
             if not mock:
-                hand = best_state[0]
-                if len(hand) == 0:
-                    print("Empty hand")
-                    hand = np.zeros((1, 33))
-
-                hand_one_hot = best_state[1]
-                if len(hand_one_hot) == 0:
-                    hand_one_hot = [0]
-
-                self.current_game_hand_states.append(hand)
-                self.current_game_hand_one_hot.append(hand_one_hot)
-                self.current_game_kingdom_states.append(best_state[2])
-                self.current_game_kingdom_one_hot.append(best_state[3])
-                self.current_game_opponent_states.append(best_state[4])
-                self.current_game_states.append(best_state[5])
-            return best_response
+                self.record_state(best_state)
+            return self.remember(key, best_response)
         return True
 
-    def hprint(self, string):
+    def hprint(self, message: str, *args):
         pass
 
-    def cprint(self, string):
-        print(string)
+    def cprint(self, message: str, *args):
+        self.log.debug("player", message, *args)
 
     def show(self, lead=""):
         pass
 
 
+class MCTSPlayer(NNPlayer):
+    # Chooses turn-level actions and buys with a PUCT search over the rest of
+    # its turn. Each simulation runs on a clone of the game with the hidden
+    # cards reshuffled, follows the tree through the player's later decisions
+    # and is scored by the network once it reaches an unexpanded decision or
+    # the end of the turn. The network's scores of the options also seed the
+    # priors. The subtree below the chosen option is kept for the next
+    # decision of the same turn. Other decisions are left to NNPlayer.
+    #
+    # With a rollout policy, simulations that reach the end of the turn are
+    # scored by playing the game out with that policy instead of the network.
+    def __init__(
+        self,
+        name: str,
+        order: int,
+        simulations: Optional[int] = 64,
+        time_budget: Optional[float] = None,
+        c_puct: float = 1.5,
+        prior_temperature: float = 0.1,
+        rollout: Rollout.RolloutPolicy = None,
+        rollouts: int = 1,
+        initial_exploration_temperature: float = 0.001,
+        game_index: int = 1,
+        max_mock_depth: int = 1,
+    ):
+        NNPlayer.__init__(
+            self,
+            name,
+            order,
+            initial_exploration_temperature=initial_exploration_temperature,
+            game_index=game_index,
+            max_mock_depth=max_mock_depth,
+        )
+        if simulations is None and time_budget is None:
+            raise ValueError("MCTSPlayer needs a simulation count or a time budget")
+        self.simulations = simulations
+        self.time_budget = time_budget
+        self.c_puct = c_puct
+        self.prior_temperature = prior_temperature
+        self.rollout = rollout
+        self.rollouts = rollouts
+
+        self.reuse: MCTS.Edge = None
+        self.reuse_turn = -1
+        # Set on this player's copies while they play out a simulation
+        self.path: List[Tuple[MCTS.Node, MCTS.Edge]] = None
+        self.current: MCTS.Edge = None
+
+    def clone(self) -> MCTSPlayer:
+        other = NNPlayer.clone(self)
+        other.reuse = None
+        other.path = None
+        other.current = None
+        return other
+
+    def choose_action(
+        self,
+        game: Game.Game,
+        network: DominionNetwork,
+        optional: bool = True,
+        mock: bool = False,
+    ) -> str:
+        if game.decision_point != "action":
+            return NNPlayer.choose_action(self, game, network, optional, mock)
+        game.decision_point = None
+
+        options: List[Optional[str]] = [None] if optional else []
+        for card in NNPlayer.distinct_cards(
+            [card for card in self.hand if card.is_action]
+        )[0]:
+            options.append(card.name)
+        if len(options) <= 1 and self.path is None:
+            return NNPlayer.choose_action(self, game, network, optional, mock)
+        return self.decide(game, network, "action", options, mock)
+
+    def choose_buy(
+        self,
+        game: Game.Game,
+        network: DominionNetwork,
+        upto: int,
+        exact: bool = False,
+        optional: bool = False,
+        gain: bool = False,
+        mock: bool = False,
+        constraint: str = None,
+        destination: str = None,
+    ) -> str:
+        if game.decision_point != "buy":
+            return NNPlayer.choose_buy(
+                self,
+                game,
+                network,
+                upto,
+                exact=exact,
+                optional=optional,
+                gain=gain,
+                mock=mock,
+                constraint=constraint,
+                destination=destination,
+            )
+        game.decision_point = None
+
+        options: List[Optional[str]] = [
+            card_name
+            for card_name, count in game.supply.items()
+            if count > 0 and CardNameMap[card_name].cost <= upto
+        ]
+        if optional:
+            options.append(None)
+        if len(options) <= 1 and self.path is None:
+            return NNPlayer.choose_buy(
+                self, game, network, upto, optional=optional, mock=mock
+            )
+        return self.decide(game, network, "buy", options, mock)
+
+    def decide(
+        self,
+        game: Game.Game,
+        network: DominionNetwork,
+        kind: str,
+        options: List[Optional[str]],
+        mock: bool,
+    ) -> Optional[str]:
+        if len(options) == 0:
+            return None
+        key = (kind, tuple(options))
+        if self.path is not None:
+            return self.walk(game, network, key, options)
+
+        root = None
+        if self.reuse is not None and self.reuse_turn == self.turns:
+            root = self.reuse.next.get(key)
+        if root is None:
+            root = MCTS.Node(key)
+        # A reused root was expanded on a determinized copy, so its priors and
+        # positions are recomputed from the real game
+        self.expand(root, game, network, options)
+        self.search(game, network, root, self.simulations, self.time_budget)
+
+        choice = root.most_visited()
+        edge = root.edges[choice]
+        if self.log.enabled(Log.DEBUG):
+            for option, option_edge in root.edges.items():
+                self.log.debug(
+                    "search",
+                    "%s: %d visits, value %s, prior %s",
+                    option,
+                    option_edge.visits,
+                    option_edge.value(),
+                    option_edge.prior,
+                )
+        if not mock:
+            self.record_state(edge.state)
+        self.reuse = edge
+        self.reuse_turn = self.turns
+        return choice
+
+    def search(
+        self,
+        game: Game.Game,
+        network: DominionNetwork,
+        root: MCTS.Node,
+        simulations: Optional[int],
+        time_budget: Optional[float],
+    ):
+        start = time.monotonic()
+        done = 0
+        while (simulations is None or done < simulations) and (
+            time_budget is None or time.monotonic() - start < time_budget
+        ):
+            self.simulate(game, network, root)
+            done += 1
+
+    def expand(
+        self,
+        node: MCTS.Node,
+        game: Game.Game,
+        network: DominionNetwork,
+        options: List[Optional[str]],
+    ) -> float:
+        states = []
+        for option in options:
+            card = CardNameMap[option] if option else None
+            if node.key[0] == "action":
+                states.append(self.play_action_and_get_game_state(game, card, network))
+            else:
+                states.append(self.buy_card_and_get_game_state(game, card, network))
+        values = network.eval_positions(states)
+        node.expand(options, values, states, self.prior_temperature)
+        return max(values)
+
+    def walk(
+        self,
+        game: Game.Game,
+        network: DominionNetwork,
+        key: Tuple,
+        options: List[Optional[str]],
+    ) -> Optional[str]:
+        node = self.current.next.get(key)
+        if node is None:
+            node = MCTS.Node(key)
+            self.current.next[key] = node
+        if not node.expanded():
+            raise MCTS.LeafReached(self.expand(node, game, network, options))
+
+        option = node.select(self.c_puct)
+        self.current = node.edges[option]
+        self.path.append((node, self.current))
+        return option
+
+    def simulate(self, game: Game.Game, network: DominionNetwork, root: MCTS.Node):
+        sim = MCTS.simulation_game(game)
+        me = sim.players[game.players.index(self)]
+        MCTS.determinize(sim, me)
+        # Decisions off the tree use the cheap fallback policies
+        for player in sim.players:
+            if isinstance(player, NNPlayer):
+                player.max_mock_depth = -1
+
+        option = root.select(self.c_puct)
+        me.current = root.edges[option]
+        me.path = [(root, me.current)]
+        try:
+            if root.key[0] == "action":
+                if option:
+                    sim.play_action(me, option, network)
+                else:
+                    me.actions = 0
+                sim.action_phase(me, network)
+                sim.treasure_phase(me, network)
+            elif option:
+                sim.buy_card(me, option, network)
+            else:
+                me.buys = 0
+            sim.buy_phase(me, network)
+            if self.rollout is not None:
+                value = self.rollout.evaluate(sim, sim.players.index(me), self.rollouts)
+            else:
+                value = network.eval_position(sim.get_game_state(me))
+        except MCTS.LeafReached as leaf:
+            value = leaf.value
+
+        for node, edge in me.path:
+            node.visits += 1
+            edge.visits += 1
+            edge.value_sum += value
+
+
+class ParallelMCTSPlayer(MCTSPlayer):
+    # MCTSPlayer whose searches run on a MCTS.SearchPool. Every worker searches
+    # its own tree from the same root and the root statistics are summed, so
+    # the simulation count is split between the workers while a time budget
+    # applies to each of them. The workers' trees are not sent back, so the
+    # next decision starts a fresh tree.
+    def __init__(
+        self,
+        name: str,
+        order: int,
+        pool: MCTS.SearchPool,
+        simulations: Optional[int] = 256,
+        time_budget: Optional[float] = None,
+        c_puct: float = 1.5,
+        prior_temperature: float = 0.1,
+        rollout: Rollout.RolloutPolicy = None,
+        rollouts: int = 1,
+        initial_exploration_temperature: float = 0.001,
+        game_index: int = 1,
+        max_mock_depth: int = 1,
+    ):
+        MCTSPlayer.__init__(
+            self,
+            name,
+            order,
+            simulations=simulations,
+            time_budget=time_budget,
+            c_puct=c_puct,
+            prior_temperature=prior_temperature,
+            rollout=rollout,
+            rollouts=rollouts,
+            initial_exploration_temperature=initial_exploration_temperature,
+            game_index=game_index,
+            max_mock_depth=max_mock_depth,
+        )
+        self.pool = pool
+
+    def clone(self) -> ParallelMCTSPlayer:
+        # Copies search in-process, which is also what keeps the pool out of
+        # the games sent to the workers
+        other = MCTSPlayer.clone(self)
+        other.pool = None
+        return other
+
+    def search(
+        self,
+        game: Game.Game,
+        network: DominionNetwork,
+        root: MCTS.Node,
+        simulations: Optional[int],
+        time_budget: Optional[float],
+    ):
+        if self.pool is None:
+            MCTSPlayer.search(self, game, network, root, simulations, time_budget)
+        else:
+            self.pool.search(
+                game, game.players.index(self), root, simulations, time_budget
+            )
+
+
 class ComputerPlayer(Player):
+    autoplay_treasures = True
+
     def __init__(self, name: str, order: int, sp: bool = True):
         Player.__init__(self, name, order)
         # beginning and middle of game
@@ -984,7 +1567,7 @@ class ComputerPlayer(Player):
         TBP = 0
         for c in cardlist:
             TBP += c.buypower
-            if "action" in c.categories:
+            if c.is_action:
                 TBP += c.coins
         return TBP
 
@@ -997,10 +1580,11 @@ class ComputerPlayer(Player):
 
     def action_balance(self):
         balance = 0
-        for c in self.stack():
-            if "action" in c.categories:
-                balance = balance - 1 + c.actions
-        return 70 * balance / len(self.stack())
+        for card_name, count in self.owned.items():
+            c = CardNameMap[card_name]
+            if c.is_action:
+                balance += count * (c.actions - 1)
+        return 70 * balance / self.num_cards
 
     def choose_action(
         self,
@@ -1011,7 +1595,7 @@ class ComputerPlayer(Player):
     ) -> str:
         self.hand.sort(key=lambda x: ComputerPlayer.Findex(x.name, self.playtable1))
         for card in reversed(self.hand):
-            if "action" in card.categories:
+            if card.is_action:
                 return card.name
         return None
 
@@ -1028,7 +1612,7 @@ class ComputerPlayer(Player):
         destination: str = None,
     ) -> str:
         if (
-            len(game.supply["Province"])
+            game.supply["Province"]
             > len(game.players) + ComputerPlayer.totalbuypower(self.deck) / 8
         ):
             if self.action_balance() < -10:
@@ -1041,8 +1625,8 @@ class ComputerPlayer(Player):
         for c in bgt:
             if (
                 c in game.supply
-                and len(game.supply[c]) > 0
-                and game.supply[c][0].cost <= upto
+                and game.supply[c] > 0
+                and CardNameMap[c].cost <= upto
             ):
                 return c
         return None
@@ -1065,7 +1649,7 @@ class ComputerPlayer(Player):
 
     def choose_treasure(self, game: Game.Game, network: DominionNetwork) -> str:
         for card in self.hand:
-            if "coin" in card.categories:
+            if card.is_coin:
                 return card.name
 
         return None
@@ -1083,18 +1667,20 @@ class ComputerPlayer(Player):
     ) -> bool:
         return True
 
-    def hprint(self, string: str):
+    def hprint(self, message: str, *args):
         pass
 
-    def cprint(self, string: str):
+    def cprint(self, message: str, *args):
         if not self.sp:
-            print(string)
+            print(message % args if args else message)
 
     def show(self, lead: str = ""):
         pass
 
 
 class QvistPlayer(Player):
+    autoplay_treasures = True
+
     def __init__(self, name: str, order: int, sp: bool = True):
         Player.__init__(self, name, order)
         # beginning and middle of game
@@ -1223,7 +1809,7 @@ class QvistPlayer(Player):
         TBP = 0
         for c in cardlist:
             TBP += c.buypower
-            if "action" in c.categories:
+            if c.is_action:
                 TBP += c.coins
         return TBP
 
@@ -1236,10 +1822,11 @@ class QvistPlayer(Player):
 
     def action_balance(self):
         balance = 0
-        for c in self.stack():
-            if "action" in c.categories:
-                balance = balance - 1 + c.actions
-        return 70 * balance / len(self.stack())
+        for card_name, count in self.owned.items():
+            c = CardNameMap[card_name]
+            if c.is_action:
+                balance += count * (c.actions - 1)
+        return 70 * balance / self.num_cards
 
     def choose_action(
         self,
@@ -1250,7 +1837,7 @@ class QvistPlayer(Player):
     ) -> str:
         self.hand.sort(key=lambda x: ComputerPlayer.Findex(x.name, self.playtable1))
         for card in reversed(self.hand):
-            if "action" in card.categories:
+            if card.is_action:
                 return card.name
         return None
 
@@ -1267,7 +1854,7 @@ class QvistPlayer(Player):
         destination: str = None,
     ) -> str:
         if (
-            len(game.supply["Province"])
+            game.supply["Province"]
             > len(game.players) + ComputerPlayer.totalbuypower(self.deck) / 8
         ):
             bgt = self.buygaintable1
@@ -1277,8 +1864,8 @@ class QvistPlayer(Player):
         for c in bgt:
             if (
                 c in game.supply
-                and len(game.supply[c]) > 0
-                and game.supply[c][0].cost <= upto
+                and game.supply[c] > 0
+                and CardNameMap[c].cost <= upto
             ):
                 return c
         return None
@@ -1301,7 +1888,7 @@ class QvistPlayer(Player):
 
     def choose_treasure(self, game: Game.Game, network: DominionNetwork) -> str:
         for card in self.hand:
-            if "coin" in card.categories:
+            if card.is_coin:
                 return card.name
 
         return None
@@ -1319,12 +1906,63 @@ class QvistPlayer(Player):
     ) -> bool:
         return True
 
-    def hprint(self, string: str):
+    def hprint(self, message: str, *args):
         pass
 
-    def cprint(self, string: str):
+    def cprint(self, message: str, *args):
         if not self.sp:
-            print(string)
+            print(message % args if args else message)
 
     def show(self, lead: str = ""):
         pass
+
+
+class RolloutPlayer(ComputerPlayer):
+    # Baseline opponent playing a Rollout.RolloutPolicy. Actions and buys come
+    # from the policy; gains with conditions and the choices asked for by card
+    # text are left to ComputerPlayer.
+    def __init__(self, name: str, order: int, policy: Rollout.RolloutPolicy = None):
+        ComputerPlayer.__init__(self, name, order)
+        self.policy = policy if policy is not None else Rollout.RolloutPolicy()
+
+    def choose_action(
+        self,
+        game: Game.Game,
+        network: DominionNetwork,
+        optional: bool = True,
+        mock: bool = False,
+    ) -> str:
+        c = self.policy.choose_action(self.hand)
+        if c is None:
+            return None
+        return c.name
+
+    def choose_buy(
+        self,
+        game: Game.Game,
+        network: DominionNetwork,
+        upto: int,
+        exact: bool = False,
+        optional: bool = False,
+        gain: bool = False,
+        mock: bool = False,
+        constraint: str = None,
+        destination: str = None,
+    ) -> str:
+        card_name = None
+        if not exact and constraint is None:
+            card_name = self.policy.choose_buy(game.supply, upto, self.owned)
+        if card_name is None and (not optional or exact or constraint is not None):
+            card_name = ComputerPlayer.choose_buy(
+                self,
+                game,
+                network,
+                upto,
+                exact=exact,
+                optional=optional,
+                gain=gain,
+                mock=mock,
+                constraint=constraint,
+                destination=destination,
+            )
+        return card_name
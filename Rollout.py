@@ -0,0 +1,211 @@
+from __future__ import annotations
+import random
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from Card import Card, CardNameMap
+
+if TYPE_CHECKING:
+    import Game
+
+# Kingdom cards a rollout buys instead of money, with the most copies it wants.
+# Cards missing from the supply are ignored.
+DefaultPreferences: Dict[str, int] = {
+    "Witch": 1,
+    "Laboratory": 2,
+    "Council Room": 1,
+    "Smithy": 1,
+    "Militia": 1,
+    "Moat": 1,
+}
+
+
+class Side:
+    # A player's cards during a rollout. Card.get_points reads owned and
+    # num_cards, so a side can be scored like a Player.
+    __slots__ = ("deck", "hand", "discard", "owned", "num_cards")
+
+    def __init__(
+        self,
+        deck: List[Card],
+        hand: List[Card],
+        discard: List[Card],
+        owned: Counter,
+        num_cards: int,
+    ):
+        self.deck = deck
+        self.hand = hand
+        self.discard = discard
+        self.owned = owned
+        self.num_cards = num_cards
+
+    def draw(self, count: int):
+        deck = self.deck
+        hand = self.hand
+        for _ in range(count):
+            if not deck:
+                if not self.discard:
+                    return
+                deck, self.discard = self.discard, deck
+                self.deck = deck
+                random.shuffle(deck)
+            hand.append(deck.pop())
+
+    def calcpoints(self) -> int:
+        vp = 0
+        for card_name, count in self.owned.items():
+            c = CardNameMap[card_name]
+            if count > 0 and (c.is_victory or c.is_curse):
+                vp += count * c.get_points(self)
+        return vp
+
+
+class RolloutPolicy:
+    # Big Money with a few kingdom cards, cheap enough to finish thousands of
+    # games a second. The policy holds only its settings; play_out copies what
+    # it needs from a Game into plain lists and never touches the game, its
+    # players or the log.
+    #
+    # Cards only do what their printed +cards, +actions, +buys, +coins and
+    # treasure values say. Attacks, gains, trashing and other card text are
+    # left out, as are reactions, durations and the Colony ending.
+    def __init__(
+        self,
+        preferences: Dict[str, int] = None,
+        greening: int = 4,
+        max_rounds: int = 75,
+    ):
+        self.preferences = (
+            DefaultPreferences if preferences is None else dict(preferences)
+        )
+        # Provinces left at which Gold and Silver buys turn into victory cards
+        self.greening = greening
+        self.max_rounds = max_rounds
+
+    def choose_action(self, hand: List[Card]) -> Optional[Card]:
+        # Villages first so that terminals drawn later can still be played
+        best = None
+        for card in hand:
+            if card.is_action and (
+                best is None
+                or (card.actions, card.draws, card.coins)
+                > (best.actions, best.draws, best.coins)
+            ):
+                best = card
+        return best
+
+    def choose_buy(
+        self, supply: Dict[str, int], coins: int, owned: Counter
+    ) -> Optional[str]:
+        provinces = supply["Province"]
+        if coins >= 8 and provinces > 0:
+            return "Province"
+        if coins >= 6 and provinces > self.greening and supply.get("Gold", 0):
+            return "Gold"
+        if coins >= 5 and provinces <= self.greening + 1 and supply.get("Duchy", 0):
+            return "Duchy"
+
+        wanted = None
+        for card_name, most in self.preferences.items():
+            if supply.get(card_name, 0) > 0 and owned[card_name] < most:
+                c = CardNameMap[card_name]
+                if c.cost <= coins and (wanted is None or c.cost > wanted.cost):
+                    wanted = c
+        if wanted is not None:
+            return wanted.name
+
+        if coins >= 6 and supply.get("Gold", 0):
+            return "Gold"
+        if coins >= 2 and provinces <= 2 and supply.get("Estate", 0):
+            return "Estate"
+        if coins >= 3 and supply.get("Silver", 0):
+            return "Silver"
+        return None
+
+    def take_turn(self, side: Side, supply: Dict[str, int]) -> int:
+        # Plays one turn and returns the number of supply piles it emptied
+        hand = side.hand
+        played: List[Card] = []
+        actions = 1
+        buys = 1
+        coins = 0
+        while actions > 0:
+            c = self.choose_action(hand)
+            if c is None:
+                break
+            hand.remove(c)
+            played.append(c)
+            actions += c.actions - 1
+            buys += c.buys
+            coins += c.coins
+            side.draw(c.draws)
+        for c in hand:
+            coins += c.buypower
+
+        emptied = 0
+        discard = side.discard
+        while buys > 0:
+            card_name = self.choose_buy(supply, coins, side.owned)
+            if card_name is None:
+                break
+            c = CardNameMap[card_name]
+            supply[card_name] -= 1
+            if supply[card_name] == 0:
+                emptied += 1
+            discard.append(c)
+            side.owned[card_name] += 1
+            side.num_cards += 1
+            coins -= c.cost
+            buys -= 1
+
+        discard.extend(hand)
+        discard.extend(played)
+        hand.clear()
+        side.draw(5)
+        return emptied
+
+    def play_out(self, game: Game.Game, current: int) -> List[int]:
+        # Finishes the game from the end of the current player's turn, before
+        # its cleanup, and returns everyone's points. Cards in play or set
+        # aside go to the discard pile.
+        sides: List[Side] = []
+        for idx, player in enumerate(game.players):
+            discard = player.discard + player.played + player.aside + player.hold
+            hand = list(player.hand)
+            if idx == current:
+                discard += hand
+                hand = []
+            side = Side(
+                list(player.deck),
+                hand,
+                discard,
+                Counter(player.owned),
+                player.num_cards,
+            )
+            if idx == current:
+                side.draw(5)
+            sides.append(side)
+
+        supply = dict(game.supply)
+        empty = list(supply.values()).count(0)
+        turns = len(sides) * max(self.max_rounds - game.players[current].turns, 0)
+        idx = current
+        while supply["Province"] > 0 and empty < 3 and turns > 0:
+            idx = (idx + 1) % len(sides)
+            empty += self.take_turn(sides[idx], supply)
+            turns -= 1
+        return [side.calcpoints() for side in sides]
+
+    def evaluate(self, game: Game.Game, current: int, rollouts: int = 1) -> float:
+        # Mean result for the current player over the given number of rollouts:
+        # 1 for a win, 0 for a shared first place and -1 for a loss, as in the
+        # rewards of Player.game_over
+        total = 0.0
+        for _ in range(rollouts):
+            points = self.play_out(game, current)
+            best = max(points)
+            if points[current] < best:
+                total -= 1.0
+            elif points.count(best) == 1:
+                total += 1.0
+        return total / rollouts
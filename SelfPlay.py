@@ -0,0 +1,250 @@
+from __future__ import annotations
+import multiprocessing
+import queue
+import random
+import threading
+import numpy as np
+from typing import Any, List, Dict, Optional, Tuple, Type
+
+import Game
+import Log
+import Player
+from nn.network import Network
+from nn.inference_server import InferenceServer
+from utils import process_context
+
+
+# Seatings a game is drawn from. The first character of a name picks the player:
+# "*" ComputerPlayer, "^" QvistPlayer, "+" NNPlayer, "#" MCTSPlayer and
+# "%" RolloutPlayer.
+DefaultLineups = [["*Alex", "*Ben"], ["*Alex", "+Ben"], ["+Alex", "*Ben"]]
+
+
+def play_one_game(
+    idx: int, network: Network, lineups: List[List[str]] = None
+) -> List[str]:
+    Log.default.info("game", "Game number %d", idx)
+
+    names = random.choice(lineups or DefaultLineups)
+
+    players: List[Player.Player] = []
+    networks: Dict[str, Network] = {}
+
+    for play_order, name in enumerate(names):
+        if name[0] == "*":
+            players.append(Player.ComputerPlayer(name[1:], play_order))
+        elif name[0] == "^":
+            players.append(Player.QvistPlayer(name[1:], play_order))
+        elif name[0] == "+":
+            players.append(Player.NNPlayer(name[1:], play_order, game_index=idx))
+        elif name[0] == "#":
+            players.append(Player.MCTSPlayer(name[1:], play_order, game_index=idx))
+        elif name[0] == "%":
+            players.append(Player.RolloutPlayer(name[1:], play_order))
+        else:
+            players.append(Player.Player(name, play_order))
+        networks[name[1:]] = random.choice([network])
+
+    game = Game.Game(players)
+    winners = game.play_game(networks)
+    # Once per game, however many players share the network
+    network.get_summary()
+    network.checkpoint()
+    return winners
+
+
+def play_concurrent_games(
+    network: Network,
+    num_games: int,
+    concurrent_games: int,
+    max_batch_size: int,
+    max_wait: float,
+    lineups: List[List[str]] = None,
+):
+    server = InferenceServer(network, max_batch_size=max_batch_size, max_wait=max_wait)
+    server.start()
+
+    def run(first_idx: int):
+        server.connect()
+        try:
+            for idx in range(first_idx, num_games, concurrent_games):
+                play_one_game(idx, server, lineups)
+        finally:
+            server.disconnect()
+
+    threads = [
+        threading.Thread(target=run, args=(first_idx,))
+        for first_idx in range(concurrent_games)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.stop()
+
+
+class TrajectoryRecorder:
+    # Stands in for the network inside a self-play worker. Positions are scored
+    # by the worker's own copy of the model and the experience produced by
+    # Player.game_over is kept for the learner instead of being trained on.
+    def __init__(self, network: Network):
+        self.network = network
+        self.batches: List[Tuple[Any, ...]] = []
+
+    def eval_position(self, board_state) -> float:
+        return self.network.eval_position(board_state)
+
+    def eval_positions(self, board_states) -> List[float]:
+        return self.network.eval_positions(board_states)
+
+    def add_experience(self, *samples):
+        self.batches.append(samples)
+
+    def get_summary(self):
+        pass
+
+    def save(self):
+        pass
+
+    def checkpoint(self):
+        pass
+
+    def get_name(self):
+        return self.network.get_name()
+
+    def take_batches(self) -> List[Tuple[Any, ...]]:
+        batches = self.batches
+        self.batches = []
+        return batches
+
+
+def self_play_worker(
+    worker_id: int,
+    network_class: Type[Network],
+    weights: List[np.ndarray],
+    num_workers: int,
+    games_per_worker: int,
+    seed: Optional[int],
+    sync_every: int,
+    log_level: int,
+    lineups: Optional[List[List[str]]],
+    weight_queue: multiprocessing.Queue,
+    result_queue: multiprocessing.Queue,
+):
+    # Spawned workers start with a fresh default logger
+    Log.default.level = log_level
+    if seed is not None:
+        random.seed(seed + worker_id)
+        np.random.seed(seed + worker_id)
+
+    network = network_class()
+    network.set_weights(weights)
+    recorder = TrajectoryRecorder(network)
+
+    for game_number in range(games_per_worker):
+        if sync_every > 0 and game_number > 0 and game_number % sync_every == 0:
+            latest = None
+            while True:
+                try:
+                    latest = weight_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if latest is not None:
+                network.set_weights(latest)
+
+        idx = game_number * num_workers + worker_id
+        winners = play_one_game(idx, recorder, lineups)
+        result_queue.put((worker_id, idx, winners, recorder.take_batches()))
+
+    result_queue.put((worker_id, None, None, None))
+
+
+class SelfPlayRunner:
+    # Plays games on a pool of worker processes. Each worker owns its games and a
+    # read-only copy of the weights; the learner in this process trains on the
+    # trajectories they send back and periodically pushes fresh weights.
+    def __init__(
+        self,
+        network: Network,
+        num_workers: int,
+        games_per_worker: int,
+        seed: Optional[int] = None,
+        sync_every: int = 10,
+        log_level: int = None,
+        lineups: List[List[str]] = None,
+    ):
+        self.network = network
+        self.num_workers = num_workers
+        self.games_per_worker = games_per_worker
+        self.seed = seed
+        self.sync_every = sync_every
+        self.log_level = log_level if log_level is not None else Log.default.level
+        self.lineups = lineups
+
+    def run(self):
+        context = process_context()
+        result_queue = context.Queue()
+        weight_queues = [context.Queue() for _ in range(self.num_workers)]
+        weights = self.network.model.get_weights()
+
+        processes = [
+            context.Process(
+                target=self_play_worker,
+                args=(
+                    worker_id,
+                    type(self.network),
+                    weights,
+                    self.num_workers,
+                    self.games_per_worker,
+                    self.seed,
+                    self.sync_every,
+                    self.log_level,
+                    self.lineups,
+                    weight_queues[worker_id],
+                    result_queue,
+                ),
+                daemon=True,
+            )
+            for worker_id in range(self.num_workers)
+        ]
+        for process in processes:
+            process.start()
+
+        finished = set()
+        games = 0
+        while len(finished) < self.num_workers:
+            try:
+                worker_id, idx, winners, batches = result_queue.get(timeout=60)
+            except queue.Empty:
+                for process in processes:
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(
+                            "Self-play worker exited with code "
+                            + str(process.exitcode)
+                        )
+                continue
+
+            if idx is None:
+                finished.add(worker_id)
+                continue
+
+            Log.default.info(
+                "selfplay", "Worker %d finished game %d", worker_id, idx
+            )
+            for batch in batches:
+                self.network.add_experience(*batch)
+            self.network.get_summary()
+            self.network.checkpoint()
+            games += 1
+
+            if self.sync_every > 0 and games % self.sync_every == 0:
+                weights = self.network.model.get_weights()
+                for worker_id, weight_queue in enumerate(weight_queues):
+                    if worker_id not in finished:
+                        weight_queue.put(weights)
+
+        for process in processes:
+            process.join()
+        # Weights pushed after a worker's last sync are never read
+        for weight_queue in weight_queues:
+            weight_queue.cancel_join_thread()
@@ -0,0 +1,210 @@
+from __future__ import annotations
+import numpy as np
+from typing import TYPE_CHECKING, Tuple
+
+import Game
+import Player
+import Card
+
+if TYPE_CHECKING:
+    import CompactState
+from utils import players_around
+
+# Columns of a card's row in the hand and kingdom inputs. This is the only
+# description of the layout; the network's input shape depends on it.
+#   0       cost / 8
+#   1       victory points / 6, for the player being encoded
+#   2-7     one flag per FeatureCategories entry
+#   8-21    unused, always 0
+#   22-32   counts / 10: supply, the player's deck, discard and hand, the
+#           discard and owned cards of up to three opponents, and the trash
+COST = 0
+POINTS = 1
+CATEGORIES = 2
+SUPPLY = 22
+DECK = 23
+DISCARD = 24
+HAND = 25
+OPPONENT_DISCARD = 26
+OPPONENT_STACK = 29
+TRASH = 32
+NUM_FEATURES = 33
+
+FeatureCategories = ["victory", "action", "coin", "attack", "reaction", "duration"]
+
+
+class StateEncoder:
+    # Builds the six network inputs as float32 arrays. Every card gets a row in
+    # a reusable table: the columns that only depend on the card are filled
+    # once, counts come from the players' zone counters and the hand and
+    # kingdom inputs are gathered from the table by card index.
+    def __init__(self):
+        self.num_cards = len(Card.CardIndexMap)
+        self.cards = [Card.CardNameMap[card_name] for card_name in Card.CardIndexMap]
+        self.static = np.zeros((self.num_cards, NUM_FEATURES), dtype=np.float32)
+        for idx, card in enumerate(self.cards):
+            self.static[idx, COST] = card.cost / 8
+            self.static[idx, POINTS] = card.vpoints / 6
+            for offset, category in enumerate(FeatureCategories):
+                self.static[idx, CATEGORIES + offset] = card.has_category(category)
+        self.static.flags.writeable = False
+
+        self.dynamic_points = [
+            idx
+            for idx, card in enumerate(self.cards)
+            if type(card).get_points is not Card.Card.get_points
+        ]
+
+        self.table = np.empty_like(self.static)
+
+    def fill_counts(self, column: int, counts):
+        for card_name, count in counts.items():
+            if count:
+                self.table[Card.CardIndexMap[card_name], column] = count
+
+    def encode(
+        self, game: Game.Game, player: Player.Player, cards_to_draw: int = 0,
+    ) -> Tuple[
+        np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+    ]:
+        index = Card.CardIndexMap
+        table = self.table
+        np.copyto(table, self.static)
+
+        for card_name, count in game.supply.items():
+            table[index[card_name], SUPPLY] = count
+        self.fill_counts(DECK, player.zone_counts["deck"])
+        self.fill_counts(DISCARD, player.zone_counts["discard"])
+        self.fill_counts(HAND, player.zone_counts["hand"])
+        self.fill_counts(TRASH, game.trash_counts)
+
+        opponents = players_around(game.players, player, inclusive=False)
+        opponent_states = np.zeros((len(opponents), 5), dtype=np.float32)
+        for idx, opponent in enumerate(opponents):
+            self.fill_counts(OPPONENT_DISCARD + idx, opponent.zone_counts["discard"])
+            self.fill_counts(OPPONENT_STACK + idx, opponent.owned)
+            opponent_states[idx] = (
+                len(opponent.deck) / 40,
+                len(opponent.discard) / 40,
+                len(opponent.hand) / 5,
+                opponent.calcpoints() / 30,
+                opponent.our_turn,
+            )
+        table[:, SUPPLY:] /= 10
+
+        hand_one_hot = np.fromiter(
+            (index[card.name] for card in player.hand),
+            dtype=np.int32,
+            count=len(player.hand),
+        )
+        kingdom_one_hot = np.fromiter(
+            (index[card_name] for card_name in game.supply),
+            dtype=np.int32,
+            count=len(game.supply),
+        )
+
+        for idx in self.dynamic_points:
+            if idx in hand_one_hot or idx in kingdom_one_hot:
+                table[idx, POINTS] = self.cards[idx].get_points(player) / 6
+
+        game_state = np.array(
+            [
+                player.actions,
+                player.buys,
+                game.turns / 20,
+                cards_to_draw / 5,
+                player.purse / 8,
+                player.our_turn,
+                len(player.deck) / 40,
+                len(player.discard) / 40,
+                len(player.hand) / 5,
+                player.calcpoints() / 30,
+            ],
+            dtype=np.float32,
+        )
+
+        return (
+            table[hand_one_hot],
+            hand_one_hot,
+            table[kingdom_one_hot],
+            kingdom_one_hot,
+            opponent_states,
+            game_state,
+        )
+
+    def encode_compact(
+        self,
+        state: CompactState.CompactGameState,
+        player_index: int,
+        cards_to_draw: int = 0,
+    ) -> Tuple[
+        np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+    ]:
+        # Same inputs as encode, read straight from the count vectors. The hand
+        # comes out grouped by card index rather than in hand order.
+        import CompactState
+
+        table = self.table
+        np.copyto(table, self.static)
+
+        kingdom_one_hot = state.kingdom.astype(np.int32)
+        table[:, SUPPLY] = 0
+        table[kingdom_one_hot, SUPPLY] = state.supply[kingdom_one_hot]
+        player = state.players[player_index]
+        table[:, DECK] = player.zones[CompactState.DECK]
+        table[:, DISCARD] = player.zones[CompactState.DISCARD]
+        table[:, HAND] = player.zones[CompactState.HAND]
+        table[:, TRASH] = state.trash
+
+        num_players = len(state.players)
+        opponents = [
+            state.players[(player_index + offset) % num_players]
+            for offset in range(1, num_players)
+        ]
+        opponent_states = np.zeros((len(opponents), 5), dtype=np.float32)
+        for idx, opponent in enumerate(opponents):
+            table[:, OPPONENT_DISCARD + idx] = opponent.zones[CompactState.DISCARD]
+            table[:, OPPONENT_STACK + idx] = opponent.owned()
+            opponent_states[idx] = (
+                len(opponent.deck) / 40,
+                opponent.zones[CompactState.DISCARD].sum() / 40,
+                opponent.zones[CompactState.HAND].sum() / 5,
+                opponent.calcpoints() / 30,
+                opponent.counters[Player.Player.counter_fields.index("our_turn")],
+            )
+        table[:, SUPPLY:] /= 10
+
+        hand_one_hot = np.repeat(
+            np.arange(self.num_cards, dtype=np.int32), player.zones[CompactState.HAND]
+        )
+
+        view = CompactState.OwnedView(player.owned())
+        for idx in self.dynamic_points:
+            if idx in hand_one_hot or idx in kingdom_one_hot:
+                table[idx, POINTS] = self.cards[idx].get_points(view) / 6
+
+        counters = dict(zip(Player.Player.counter_fields, player.counters))
+        game_state = np.array(
+            [
+                counters["actions"],
+                counters["buys"],
+                state.turns / 20,
+                cards_to_draw / 5,
+                counters["purse"] / 8,
+                counters["our_turn"],
+                len(player.deck) / 40,
+                player.zones[CompactState.DISCARD].sum() / 40,
+                player.zones[CompactState.HAND].sum() / 5,
+                player.calcpoints() / 30,
+            ],
+            dtype=np.float32,
+        )
+
+        return (
+            table[hand_one_hot],
+            hand_one_hot,
+            table[kingdom_one_hot],
+            kingdom_one_hot,
+            opponent_states,
+            game_state,
+        )
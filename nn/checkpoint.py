@@ -0,0 +1,129 @@
+import os
+import re
+import shutil
+import threading
+import time
+from typing import List, Optional
+
+
+class Checkpointer:
+    # Decides when a network is written to disk. A checkpoint is due every
+    # every_games games, every every_seconds seconds or whenever the training
+    # loss reaches a new best, and is written on a background thread so the
+    # games keep running. A due checkpoint is skipped while the previous one is
+    # still being written and taken after the next game instead.
+    #
+    # With keep > 0 every checkpoint is also kept under a numbered name and
+    # only the latest keep of those are left on disk.
+    def __init__(
+        self,
+        every_games: Optional[int] = 100,
+        every_seconds: Optional[float] = 600.0,
+        on_improvement: bool = False,
+        weights_only: bool = False,
+        keep: int = 0,
+    ):
+        self.every_games = every_games
+        self.every_seconds = every_seconds
+        self.on_improvement = on_improvement
+        self.weights_only = weights_only
+        self.keep = keep
+
+        self.games = 0
+        self.last_write = time.monotonic()
+        self.best_loss: Optional[float] = None
+        self.improved = False
+        # Index of the next numbered checkpoint. On the first write it picks
+        # up after the numbered files earlier runs left behind, which then
+        # count towards keep.
+        self.written: Optional[int] = None
+        self.history: List[str] = []
+        self.thread: Optional[threading.Thread] = None
+
+    def due(self) -> bool:
+        if self.every_games is not None and self.games >= self.every_games:
+            return True
+        if (
+            self.every_seconds is not None
+            and time.monotonic() - self.last_write >= self.every_seconds
+        ):
+            return True
+        return self.on_improvement and self.improved
+
+    def writing(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def game_finished(self, network, loss: Optional[float] = None):
+        self.games += 1
+        if loss is not None and (self.best_loss is None or loss < self.best_loss):
+            self.best_loss = loss
+            self.improved = True
+
+        if self.due() and not self.writing():
+            self.games = 0
+            self.improved = False
+            self.last_write = time.monotonic()
+            self.thread = threading.Thread(
+                target=self.write, args=(network,), daemon=True
+            )
+            self.thread.start()
+
+    def write(self, network):
+        path = network.get_save_path()
+        if self.keep <= 0:
+            network.write(path, self.weights_only)
+            return
+
+        stem, extension = os.path.splitext(path)
+        if self.written is None:
+            self.history = Checkpointer.numbered_files(stem, extension)
+            self.written = 0
+            if self.history:
+                self.written = Checkpointer.index_of(self.history[-1]) + 1
+        numbered = stem + "-" + str(self.written) + extension
+        self.written += 1
+        network.write(numbered, self.weights_only)
+
+        latest = os.path.join(
+            os.path.dirname(path), ".tmp-" + os.path.basename(path)
+        )
+        shutil.copyfile(numbered, latest)
+        os.replace(latest, path)
+
+        self.history.append(numbered)
+        while len(self.history) > self.keep:
+            old = self.history.pop(0)
+            if os.path.isfile(old):
+                os.remove(old)
+
+    @staticmethod
+    def index_of(numbered: str) -> int:
+        stem = os.path.splitext(numbered)[0]
+        return int(stem[stem.rindex("-") + 1 :])
+
+    @staticmethod
+    def numbered_files(stem: str, extension: str) -> List[str]:
+        # Numbered checkpoints already on disk, oldest first
+        directory, name = os.path.split(stem)
+        pattern = re.compile(re.escape(name) + r"-\d+" + re.escape(extension) + "$")
+        if not os.path.isdir(directory or "."):
+            return []
+        found = [
+            os.path.join(directory, entry)
+            for entry in os.listdir(directory or ".")
+            if pattern.match(entry)
+        ]
+        return sorted(found, key=Checkpointer.index_of)
+
+    def wait(self):
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def finish(self, network):
+        # Writes whatever was played since the last checkpoint before exiting
+        self.wait()
+        if self.games > 0 or self.improved:
+            self.games = 0
+            self.improved = False
+            self.write(network)
@@ -0,0 +1,151 @@
+import threading
+import time
+from typing import List, Optional
+
+from nn.network import Network
+
+
+class InferenceRequest:
+    def __init__(self, board_states):
+        self.board_states = board_states
+        self.scores: List[float] = []
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class InferenceServer:
+    # Stands in for a Network shared by games running on separate threads.
+    # Pending eval_positions calls from all games are collected and scored
+    # together, so the model sees one large batch instead of many small ones.
+    def __init__(
+        self, network: Network, max_batch_size: int = 256, max_wait: float = 0.005
+    ):
+        self.network = network
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self.model_lock = threading.Lock()
+        self.condition = threading.Condition()
+        self.pending: List[InferenceRequest] = []
+        self.pending_positions = 0
+        self.clients = 0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+        self.batches = 0
+        self.positions = 0
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def connect(self):
+        with self.condition:
+            self.clients += 1
+
+    def disconnect(self):
+        with self.condition:
+            self.clients -= 1
+            self.condition.notify_all()
+
+    def eval_position(self, board_state) -> float:
+        return self.eval_positions([board_state])[0]
+
+    def eval_positions(self, board_states) -> List[float]:
+        request = InferenceRequest(board_states)
+        with self.condition:
+            self.pending.append(request)
+            self.pending_positions += len(board_states)
+            self.condition.notify_all()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.scores
+
+    def batch_ready(self) -> bool:
+        # Every connected game is blocked on a request, so nothing else can arrive
+        return (
+            self.pending_positions >= self.max_batch_size
+            or len(self.pending) >= self.clients
+        )
+
+    def serve(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+
+                deadline = time.monotonic() + self.max_wait
+                while self.running and not self.batch_ready():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+                batch = self.pending
+                self.pending = []
+                self.pending_positions = 0
+
+            board_states = []
+            for request in batch:
+                board_states.extend(request.board_states)
+
+            try:
+                with self.model_lock:
+                    scores = self.network.eval_positions(board_states)
+            except BaseException as e:
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            self.batches += 1
+            self.positions += len(board_states)
+
+            start = 0
+            for request in batch:
+                end = start + len(request.board_states)
+                request.scores = scores[start:end]
+                request.done.set()
+                start = end
+
+    def update(self, *args, **kwargs):
+        with self.model_lock:
+            self.network.update(*args, **kwargs)
+
+    def add_experience(self, *samples):
+        with self.model_lock:
+            self.network.add_experience(*samples)
+
+    def get_summary(self):
+        with self.model_lock:
+            self.network.get_summary()
+        if self.batches > 0:
+            self.network.log.info(
+                "network",
+                "Inference batches: %d, mean batch size: %s",
+                self.batches,
+                self.positions / self.batches,
+            )
+
+    def save(self):
+        with self.model_lock:
+            self.network.save()
+
+    def checkpoint(self):
+        with self.model_lock:
+            self.network.checkpoint()
+
+    def get_name(self):
+        return self.network.get_name()
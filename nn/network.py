@@ -1,43 +1,119 @@
 import numpy as np
-from keras.models import load_model
 from abc import ABC, abstractmethod
+import hashlib
 import os
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
 
-save_dir = "../saved_models"
+import Log
+from nn.checkpoint import Checkpointer
+from nn.replay_buffer import ReplayBuffer
 
+save_dir = "../saved_models"
 
 class Network(ABC):
-    def __init__(self, model):
+    def __init__(self, model, cache_size: int = 65536):
         self.model = model
+        self.log = Log.default
+
+        # Scores of recently seen positions, least recently used first. Many
+        # candidates of a decision encode to the same state, so they only need
+        # one forward pass. The cache is cleared whenever the weights change.
+        # Positions are keyed by a 16 byte digest, so an entry costs around
+        # 160 bytes and a full cache of the default size about 10MB.
+        self.cache: OrderedDict = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.replay = ReplayBuffer()
+
+        # Held while the weights change or are written to disk, so background
+        # checkpoints never see a half-applied update
+        self.model_lock = threading.Lock()
+        self.checkpointer = Checkpointer()
+
         self.load()
 
         self.losses = np.zeros(5)
         self.num_losses = 0
+        self.last_loss: float = None
 
-    def eval_position(self, board_state):
-
+    @staticmethod
+    def prepare_state(board_state):
         hand = board_state[0]
         if len(hand) == 0:
-            print("Empty hand")
             hand = np.zeros((1, 33))
 
         hand_one_hot = board_state[1]
         if len(hand_one_hot) == 0:
             hand_one_hot = [0]
 
-        pred = self.model.predict(
-            [
-                np.array([hand]),
-                np.array([hand_one_hot]),
-                np.array([board_state[2]]),
-                np.array([board_state[3]]),
-                np.array([board_state[4]]),
-                np.array([board_state[5]]),
-            ]
+        return (
+            hand,
+            hand_one_hot,
+            board_state[2],
+            board_state[3],
+            board_state[4],
+            board_state[5],
         )
-        print(10 * pred[1][0][0])
-        return pred[0][0][0]
+
+    def eval_position(self, board_state):
+        return self.eval_positions([board_state])[0]
+
+    @staticmethod
+    def state_key(state) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for tensor in state:
+            tensor = np.ascontiguousarray(tensor)
+            digest.update(str((tensor.dtype.str, tensor.shape)).encode())
+            digest.update(tensor.tobytes())
+        return digest.digest()
+
+    def clear_cache(self):
+        self.cache.clear()
+
+    def eval_positions(self, board_states) -> List[float]:
+        # The recurrent inputs are not masked, so zero padding would change the
+        # prediction. Candidates are grouped by sequence lengths instead and each
+        # group is scored in a single forward pass.
+        scores: List[float] = [0.0] * len(board_states)
+        prepared = []
+        keys: List[bytes] = []
+        groups: Dict[Tuple[int, int, int], List[int]] = {}
+        pending: Dict[bytes, List[int]] = {}
+        for idx, board_state in enumerate(board_states):
+            state = Network.prepare_state(board_state)
+            prepared.append(state)
+            state_key = Network.state_key(state)
+            keys.append(state_key)
+            if state_key in self.cache:
+                self.cache.move_to_end(state_key)
+                scores[idx] = self.cache[state_key]
+                self.cache_hits += 1
+            elif state_key in pending:
+                pending[state_key].append(idx)
+                self.cache_hits += 1
+            else:
+                pending[state_key] = [idx]
+                self.cache_misses += 1
+                key = (len(state[0]), len(state[2]), len(state[4]))
+                groups.setdefault(key, []).append(idx)
+
+        for indices in groups.values():
+            pred = self.model.predict_on_batch(
+                [np.array([prepared[i][k] for i in indices]) for k in range(6)]
+            )
+            for row, idx in enumerate(indices):
+                self.log.debug("network", "vp estimate %s", 10 * pred[1][row][0])
+                state_key = keys[idx]
+                for duplicate in pending[state_key]:
+                    scores[duplicate] = pred[0][row][0]
+                self.cache[state_key] = pred[0][row][0]
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return scores
 
     def update(
         self,
@@ -50,38 +126,84 @@ class Network(ABC):
         rewards: List[float],
         points: List[float],
     ):
-        f = self.model.train_on_batch(
-            {
-                "hand": np.array(hand),
-                "hand_one_hot": np.array(hand_one_hot),
-                "kingdom": np.array(kingdom),
-                "kingdom_one_hot": np.array(kingdom_one_hot),
-                "opponent": np.array(opponent_states),
-                "game_state": np.array(game_state),
-            },
-            {"win_est": np.array(rewards), "vp_est": np.array(points)},
-            reset_metrics=True,
-        )
+        with self.model_lock:
+            f = self.model.train_on_batch(
+                {
+                    "hand": np.array(hand),
+                    "hand_one_hot": np.array(hand_one_hot),
+                    "kingdom": np.array(kingdom),
+                    "kingdom_one_hot": np.array(kingdom_one_hot),
+                    "opponent": np.array(opponent_states),
+                    "game_state": np.array(game_state),
+                },
+                {"win_est": np.array(rewards), "vp_est": np.array(points)},
+                reset_metrics=True,
+            )
+        self.clear_cache()
         self.losses += np.array(f)
         self.num_losses += 1
 
+    def add_experience(self, *samples: List):
+        # Games are stored in the replay buffer and trained on in mini-batches
+        self.replay.add(*samples)
+        for _ in range(self.replay.take_steps()):
+            self.update(*self.replay.sample())
+
+    def set_weights(self, weights):
+        with self.model_lock:
+            self.model.set_weights(weights)
+        self.clear_cache()
+
     def get_summary(self):
-        print(self.model.metrics_names)
-        print(self.losses / self.num_losses)
+        self.last_loss = None
+        if self.num_losses > 0:
+            self.last_loss = self.losses[0] / self.num_losses
+            self.log.info("network", "%s", self.model.metrics_names)
+            self.log.info("network", "%s", self.losses / self.num_losses)
         self.losses = np.zeros(5)
         self.num_losses = 0
+        lookups = self.cache_hits + self.cache_misses
+        if lookups > 0:
+            self.log.info(
+                "network",
+                "Position cache hits: %d, misses: %d, hit rate: %s",
+                self.cache_hits,
+                self.cache_misses,
+                self.cache_hits / lookups,
+            )
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def get_save_path(self) -> str:
+        return os.path.join(save_dir, self.get_save_file())
 
     def load(self):
-        model_path = os.path.join(save_dir, self.get_save_file())
+        model_path = self.get_save_path()
         if os.path.isfile(model_path):
             self.model.load_weights(model_path, skip_mismatch=True)
-            print("Loaded model from", model_path)
+            self.clear_cache()
+            self.log.info("network", "Loaded model from %s", model_path)
+
+    def write(self, path: str, weights_only: bool = False):
+        # Written next to the target and renamed over it, so a crash mid-write
+        # never leaves a truncated model behind
+        directory, name = os.path.split(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        temp_path = os.path.join(directory, ".tmp-" + name)
+        with self.model_lock:
+            if weights_only:
+                self.model.save_weights(temp_path)
+            else:
+                self.model.save(temp_path)
+        os.replace(temp_path, path)
 
     def save(self):
-        if not os.path.isdir(save_dir):
-            os.makedirs(save_dir)
-        model_path = os.path.join(save_dir, self.get_save_file())
-        self.model.save(model_path)
+        self.checkpointer.wait()
+        self.write(self.get_save_path())
+
+    def checkpoint(self):
+        self.checkpointer.game_finished(self, self.last_loss)
 
     @abstractmethod
     def get_save_file(self):
@@ -0,0 +1,66 @@
+import random
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+class ReplayBuffer:
+    # Training samples from finished games, kept until capacity is reached and
+    # then dropped oldest first. The recurrent inputs are not masked, so samples
+    # are bucketed by their hand, kingdom and opponent lengths and every
+    # mini-batch is drawn from a single bucket instead of being padded.
+    #
+    # replay_ratio is the number of times each sample is expected to be trained
+    # on, which sets how many gradient steps follow each added game.
+    def __init__(
+        self,
+        capacity: int = 100000,
+        batch_size: int = 32,
+        replay_ratio: float = 1.0,
+        min_size: int = None,
+    ):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.replay_ratio = replay_ratio
+        self.min_size = min_size if min_size is not None else batch_size
+
+        self.buckets: Dict[Tuple[int, int, int], List[Tuple[Any, ...]]] = {}
+        # Bucket of every stored sample in insertion order, for eviction
+        self.order: List[Tuple[int, int, int]] = []
+        self.oldest = 0
+        self.size = 0
+        self.pending_steps = 0.0
+
+    def add(self, *samples: List[Any]):
+        # Takes the eight lists passed to Network.update
+        for sample in zip(*samples):
+            key = (len(sample[0]), len(sample[2]), len(sample[4]))
+            self.buckets.setdefault(key, []).append(sample)
+            self.order.append(key)
+            self.size += 1
+            self.pending_steps += self.replay_ratio / self.batch_size
+
+        while self.size > self.capacity:
+            key = self.order[self.oldest]
+            self.oldest += 1
+            del self.buckets[key][0]
+            if len(self.buckets[key]) == 0:
+                del self.buckets[key]
+            self.size -= 1
+        if self.oldest > self.capacity:
+            del self.order[: self.oldest]
+            self.oldest = 0
+
+    def sample(self) -> List[np.ndarray]:
+        keys = list(self.buckets)
+        key = random.choices(keys, weights=[len(self.buckets[k]) for k in keys])[0]
+        bucket = self.buckets[key]
+        batch = random.sample(bucket, min(self.batch_size, len(bucket)))
+        return [np.array([sample[k] for sample in batch]) for k in range(8)]
+
+    def take_steps(self) -> int:
+        if self.size < self.min_size:
+            return 0
+        steps = int(self.pending_steps)
+        self.pending_steps -= steps
+        return steps
@@ -1,3 +1,17 @@
+import multiprocessing
+
+CategoryBits = {
+    category: 1 << bit
+    for bit, category in enumerate(
+        ["curse", "victory", "action", "coin", "attack", "reaction", "duration"]
+    )
+}
+
+
+# Card imports this module, so the card table is looked up on first use
+CardNameMap = None
+
+
 def namesinlist(cardlist):
     namelist = []
     for c in cardlist:
@@ -6,11 +20,10 @@ def namesinlist(cardlist):
 
 
 def catinlist(cardlist):
-    catlist = set()
+    flags = 0
     for c in cardlist:
-        for cat in c.categories:
-            catlist.add(cat)
-    return list(catlist)
+        flags |= c.flags
+    return [cat for cat, bit in CategoryBits.items() if flags & bit]
 
 
 def getcard(
@@ -25,24 +38,28 @@ def getcard(
         print(name + " is not in this game.")
         raise ValueError
     if not target_list:
-        target_list = supply[name]
-    nameslist = namesinlist(target_list)
-    if name not in nameslist:
-        print("There is no " + name + " in " + target_name)
-        raise ValueError
-    i = nameslist.index(name)
-    c = target_list[i]
-    category_match = False
-    for cat in c.categories:
-        if cat in categories:
-            category_match = True
-            break
-
-    if not category_match:
-        catstring = categories[0]
-        for i in categories[1:]:
-            catstring = catstring + " or " + categories[i]
-        print(name + " is not a " + catstring + " card.")
+        # Piles are counts over the shared card instances
+        global CardNameMap
+        if CardNameMap is None:
+            from Card import CardNameMap
+
+        if supply[name] == 0:
+            print("There is no " + name + " in " + target_name)
+            raise ValueError
+        c = CardNameMap[name]
+    else:
+        nameslist = namesinlist(target_list)
+        if name not in nameslist:
+            print("There is no " + name + " in " + target_name)
+            raise ValueError
+        i = nameslist.index(name)
+        c = target_list[i]
+    category_mask = 0
+    for cat in categories:
+        category_mask |= CategoryBits[cat]
+
+    if not c.flags & category_mask:
+        print(name + " is not a " + " or ".join(categories) + " card.")
         raise ValueError
     if c.cost > upto:
         print(name + " costs " + str(c.cost))
@@ -56,3 +73,9 @@ def players_around(players, this_player, inclusive=False):
         return around[:]
     else:
         return around[1:]
+
+
+def process_context():
+    # For every process pool that loads a network. Keras does not survive a
+    # fork once the model exists, so workers are spawned.
+    return multiprocessing.get_context("spawn")